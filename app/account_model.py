@@ -1,8 +1,16 @@
 from PySide6.QtWidgets import QTreeView, QStyledItemDelegate, QLineEdit
-from PySide6.QtGui import QStandardItemModel, QStandardItem, QIcon
-from PySide6.QtCore import Qt, QRect, QSize
+from PySide6.QtGui import QIcon
+from PySide6.QtCore import Qt, QPoint, QRect, QSize, QAbstractItemModel, QModelIndex, QTimer, Signal
+from bisect import bisect
+from dataclasses import fields as dataclass_fields
+from functools import lru_cache
 import os
 
+from app.database import PAGE_SIZE, nocase_key, rank_score
+
+# Load the next page once a group's last loaded row is this close to being on screen
+PREFETCH_ROWS = 50
+
 class AccountTreeView(QTreeView):
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -11,18 +19,81 @@ class AccountTreeView(QTreeView):
         self.setUniformRowHeights(True)
         self.setContextMenuPolicy(Qt.CustomContextMenu)
         self.customContextMenuRequested.connect(self.show_context_menu)
+        self._fetch_timer = QTimer(self)
+        self._fetch_timer.setSingleShot(True)
+        self._fetch_timer.timeout.connect(self.fetch_visible)
+        self.verticalScrollBar().valueChanged.connect(lambda _value: self._fetch_timer.start())
 
-    def show_context_menu(self, pos):
-        index = self.indexAt(pos)
-        if not index.isValid():
+    def fetch_visible(self):
+        """Page in more accounts for every group whose loaded tail is on screen."""
+        model = self.model()
+        if model is None:
             return
-        item = self.model().itemFromIndex(index)
+        bottom = self.viewport().height()
+        index = self.indexAt(QPoint(0, 0))
+        parents = []
+        while index.isValid() and self.visualRect(index).top() < bottom:
+            parent = index.parent()
+            if (
+                model.is_account(index)
+                and index.row() >= model.rowCount(parent) - PREFETCH_ROWS
+                and model.has_more(parent)
+                and parent not in parents
+            ):
+                parents.append(parent)
+            index = self.indexBelow(index)
+        for parent in parents:
+            model.fetchMore(parent)
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self._fetch_timer.start()
 
-        if not item.parent() or not item.parent().parent():
+    def rowsInserted(self, parent, start, end):
+        super().rowsInserted(parent, start, end)
+        # New region/type groups open expanded, like a fresh load
+        if parent.isValid() and parent.parent().isValid():
+            return
+        for row in range(start, end + 1):
+            self._expand_groups(self.model().index(row, 0, parent))
+
+    def reset(self):
+        super().reset()
+        # A reset model (reload, new search) opens with every group expanded
+        model = self.model()
+        if model is not None:
+            for row in range(model.rowCount()):
+                self._expand_groups(model.index(row, 0))
+
+    def _expand_groups(self, index):
+        self.expand(index)
+        if index.parent().isValid():
+            return
+        for row in range(self.model().rowCount(index)):
+            self.expand(self.model().index(row, 0, index))
+
+    def show_context_menu(self, pos):
+        index = self.indexAt(pos)
+        if not index.isValid() or not self.model().is_account(index):
             return
         self.parent().show_account_context_menu(index, self.viewport().mapToGlobal(pos))
 
-class PasswordDelegate(QStyledItemDelegate):
+class MaskingDelegate(QStyledItemDelegate):
+    """Draws account cells as *** while `masked` is set; the model always holds the real text."""
+
+    def __init__(self, masked=False, parent=None):
+        super().__init__(parent)
+        self.masked = masked
+
+    def initStyleOption(self, option, index):
+        super().initStyleOption(option, index)
+        if self.masked and index.data(Qt.UserRole) is not None:
+            option.text = "***"
+
+class PasswordDelegate(MaskingDelegate):
+    def __init__(self, parent=None):
+        super().__init__(True, parent)
+
     def createEditor(self, parent, option, index):
         editor = QLineEdit(parent)
         editor.setEchoMode(QLineEdit.Normal)
@@ -33,56 +104,597 @@ class PasswordDelegate(QStyledItemDelegate):
         editor.setText(value)
 
     def setModelData(self, editor, model, index):
-        text = editor.text()
-        model.setData(index, "***")
-        model.setData(index, text, Qt.UserRole + 1)
+        model.setData(index, editor.text(), Qt.EditRole)
+
+RANK_KEY_ROLE = Qt.UserRole + 2
+RANK_ICONS = {
+    "I": "iron.png",
+    "B": "bronze.png",
+    "S": "silver.png",
+    "G": "gold.png",
+    "P": "platinum.png",
+    "E": "emerald.png",
+    "D": "diamond.png",
+    "M": "master.png",
+    "GM": "grandmaster.png",
+    "C": "challenger.png"
+}
+
+
+@lru_cache(maxsize=1024)
+def rank_key(ranked):
+    # "GII/45LP" -> "G", "GM 320LP" -> "GM", "" -> ""
+    test = (ranked or "").strip().upper()
+    if not test:
+        return ""
+    if test.startswith("GM"):
+        return "GM"
+    return test[0] if test[0] in RANK_ICONS else ""
 
-from PySide6.QtWidgets import QStyledItemDelegate
-from PySide6.QtGui import QIcon
-from PySide6.QtCore import QRect, QSize, Qt
-import os
 
 class RankOnlyIconDelegate(QStyledItemDelegate):
     def __init__(self, icon_folder, parent=None):
         super().__init__(parent)
         self.icon_folder = icon_folder
-        self.icon_map = {
-            "I": "iron.png",
-            "B": "bronze.png",
-            "S": "silver.png",
-            "G": "gold.png",
-            "P": "platinum.png",
-            "E": "emerald.png",
-            "D": "diamond.png",
-            "M": "master.png",
-            "GM": "grandmaster.png",
-            "C": "challenger.png"
-        }
+        self.icon_map = RANK_ICONS
         self.icon_width = 24
         self.icon_height = 18
+        # (rank key, device pixel ratio) -> pixmap rendered at the final size
+        self._pixmaps = {}
+
+    def _pixmap(self, key, dpr):
+        pixmap = self._pixmaps.get((key, dpr))
+        if pixmap is None:
+            self._preload(dpr)
+            pixmap = self._pixmaps[(key, dpr)]
+        return pixmap
+
+    def _preload(self, dpr):
+        size = QSize(self.icon_width, self.icon_height)
+        for key in list(self.icon_map) + [""]:
+            icon_name = self.icon_map.get(key, "unranked.png")
+            icon = QIcon(os.path.join(self.icon_folder, icon_name))
+            self._pixmaps[(key, dpr)] = icon.pixmap(size, dpr)
 
     def paint(self, painter, option, index):
-        parent = index.parent()
-        # Only paint for account rows (region and type as parents)
-        if not parent.isValid() or not parent.parent().isValid():
+        key = index.data(RANK_KEY_ROLE)
+        # Only paint for account rows, groups have no rank key
+        if key is None:
             return
-        value = index.sibling(index.row(), index.column() + 1).data(Qt.DisplayRole)
-        rank_key = None
-        if value:
-            test = value.strip().upper()
-            if test.startswith("GM"):
-                rank_key = "GM"
-            else:
-                rank_key = test[0]
-        icon_name = self.icon_map.get(rank_key, "unranked.png")
-        icon_path = os.path.join(self.icon_folder, icon_name)
-        icon = QIcon(icon_path)
+        pixmap = self._pixmap(key, painter.device().devicePixelRatioF())
         icon_rect = QRect(
             option.rect.left() + (self.icon_width - self.icon_height) // 2,
             option.rect.top() + (option.rect.height() - self.icon_height) // 2,
             self.icon_width, self.icon_height
         )
-        icon.paint(painter, icon_rect, Qt.AlignCenter)
+        pixmap_size = pixmap.deviceIndependentSize().toSize()
+        painter.drawPixmap(
+            icon_rect.left() + (icon_rect.width() - pixmap_size.width()) // 2,
+            icon_rect.top() + (icon_rect.height() - pixmap_size.height()) // 2,
+            pixmap,
+        )
 
     def sizeHint(self, option, index):
-        return QSize(self.icon_width, self.icon_height)
\ No newline at end of file
+        return QSize(self.icon_width, self.icon_height)
+
+COLUMNS = [
+    "Username", "Password", "Level", "Email", "", "Rank",
+    "Wins/Losses", "Winrate", "Riot ID"
+]
+# Columns an account row can edit, and the Account field behind each one
+EDITABLE_FIELDS = {0: "username", 1: "password", 2: "level", 3: "mail", 5: "ranked", 6: "wins", 8: "riot_id"}
+# Rank and Wins/Losses only make sense for accounts that can play ranked
+RANKED_COLUMNS = (5, 6)
+# Header columns that sort, and the sort name behind each (see database.SORT_EXPRESSIONS)
+SORT_FIELDS = {0: "username", 2: "level", 4: "rank", 5: "rank", 6: "wins", 7: "winrate"}
+# Python keys matching the SQL ordering (the id breaks ties, as in the page queries)
+SORT_KEYS = {
+    "username": lambda acc: (nocase_key(acc.username), acc.id),
+    "level": lambda acc: (acc.level, acc.id),
+    "rank": lambda acc: (rank_score(acc.ranked), acc.id),
+    "wins": lambda acc: (acc.wins, acc.id),
+    "winrate": lambda acc: (acc.winrate, acc.id),
+}
+DEFAULT_SORT_COLUMN = 2
+
+# Looking up Qt enum members is slow in PySide6, so data()/flags() use these
+DISPLAY_ROLE = Qt.DisplayRole
+EDIT_ROLE = Qt.EditRole
+ALIGNMENT_ROLE = Qt.TextAlignmentRole
+ID_ROLE = Qt.UserRole
+SECRET_ROLE = Qt.UserRole + 1
+ALIGN_CENTER = Qt.AlignCenter
+READ_ONLY_FLAGS = Qt.ItemIsSelectable | Qt.ItemIsEnabled
+EDITABLE_FLAGS = READ_ONLY_FLAGS | Qt.ItemIsEditable
+
+
+class GroupNode:
+    __slots__ = ("name", "parent", "depth", "children", "_rows", "exhausted", "cursor")
+
+    def __init__(self, name, parent=None, exhausted=True):
+        self.name = name
+        self.parent = parent
+        self.depth = parent.depth + 1 if parent else 0
+        self.children = []
+        self._rows = None
+        # Type groups loaded page by page: False until the last page arrived
+        self.exhausted = exhausted
+        # Keyset position (sort value, id) of the last row fetched from the database
+        self.cursor = None
+
+    def row(self):
+        return self.parent.children.index(self)
+
+    def row_of(self, account):
+        # Cached id -> row lookup so streaming updates don't scan the list
+        if self._rows is None:
+            self._rows = {acc.id: row for row, acc in enumerate(self.children)}
+        return self._rows[account.id]
+
+
+class AccountTreeModel(QAbstractItemModel):
+    """Region -> type -> account tree that renders Account objects on demand.
+
+    Built from a grouped dict it holds every account; with `fetch_page` (see
+    DatabaseManager.fetch_group_page) and set_groups() it only knows the groups
+    up front and pages accounts in through canFetchMore/fetchMore.
+    """
+
+    # account id, changed fields, previous values of those fields
+    account_edited = Signal(int, dict, dict)
+
+    def __init__(self, accounts=None, parent=None, sort="level", descending=True, fetch_page=None):
+        super().__init__(parent)
+        self._sort = sort
+        self._sort_key = SORT_KEYS[sort]
+        self._sort_reverse = descending
+        self._fetch_page = fetch_page
+        self._search = None
+        self._root = GroupNode("")
+        self._by_id = {}
+        for region, types in sorted((accounts or {}).items()):
+            region_node = GroupNode(region, self._root)
+            self._root.children.append(region_node)
+            for ttype, accs in sorted(types.items()):
+                type_node = GroupNode(ttype, region_node)
+                type_node.children = sorted(accs, key=self._sort_key, reverse=self._sort_reverse)
+                region_node.children.append(type_node)
+                for acc in type_node.children:
+                    self._by_id[acc.id] = (type_node, acc)
+
+    # Structure
+
+    def index(self, row, column, parent=QModelIndex()):
+        node = self._node(parent)
+        if node is None or not (0 <= row < len(node.children)) or not (0 <= column < len(COLUMNS)):
+            return QModelIndex()
+        return self.createIndex(row, column, node)
+
+    def parent(self, index):
+        if not index.isValid():
+            return QModelIndex()
+        node = index.internalPointer()
+        if node is self._root:
+            return QModelIndex()
+        return self.createIndex(node.row(), 0, node.parent)
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.column() > 0:
+            return 0
+        node = self._node(parent)
+        return len(node.children) if node is not None else 0
+
+    def hasChildren(self, parent=QModelIndex()):
+        if parent.column() > 0:
+            return False
+        node = self._node(parent)
+        return node is not None and (bool(node.children) or not node.exhausted)
+
+    def canFetchMore(self, parent):
+        # QTreeView asks on every relayout of an expanded group, so this only lets it load the
+        # first page; later pages come from AccountTreeView.fetch_visible through has_more()
+        return self.has_more(parent) and not self._node(parent).children
+
+    def has_more(self, parent):
+        if not parent.isValid() or parent.column() > 0:
+            return False
+        node = self._node(parent)
+        return node is not None and not node.exhausted
+
+    def fetchMore(self, parent):
+        node = self._node(parent)
+        if node is None or node.exhausted or self._fetch_page is None:
+            return
+        accounts, node.cursor = self._fetch_page(
+            node.parent.name, node.name, self._sort, self._sort_reverse, node.cursor, PAGE_SIZE, self._search
+        )
+        if len(accounts) < PAGE_SIZE:
+            node.exhausted = True
+        # Accounts added while the group was partly loaded may already be in the tree
+        accounts = [acc for acc in accounts if acc.id not in self._by_id]
+        if not accounts:
+            return
+        start = len(node.children)
+        self.beginInsertRows(parent, start, start + len(accounts) - 1)
+        node.children.extend(accounts)
+        node._rows = None
+        for acc in accounts:
+            self._by_id[acc.id] = (node, acc)
+        self.endInsertRows()
+
+    def columnCount(self, parent=QModelIndex()):
+        return len(COLUMNS)
+
+    def _node(self, index):
+        # Group node whose children are the rows under `index`, None for account rows
+        if not index.isValid():
+            return self._root
+        owner = index.internalPointer()
+        if owner.depth == 2:
+            return None
+        return owner.children[index.row()]
+
+    def is_account(self, index):
+        return index.isValid() and index.internalPointer().depth == 2
+
+    def account_at(self, index):
+        if not self.is_account(index):
+            return None
+        return index.internalPointer().children[index.row()]
+
+    def account_by_id(self, acc_id):
+        entry = self._by_id.get(acc_id)
+        return entry[1] if entry else None
+
+    def group_of(self, acc_id):
+        entry = self._by_id.get(acc_id)
+        return entry[0] if entry else None
+
+    # Data
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return COLUMNS[section]
+        return None
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        owner = index.internalPointer()
+        col = index.column()
+        if owner.depth < 2:
+            if role == DISPLAY_ROLE and col == 0:
+                return owner.children[index.row()].name
+            return None
+
+        acc = owner.children[index.row()]
+        if role == DISPLAY_ROLE or role == EDIT_ROLE:
+            return self._text(acc, col)
+        if role == ALIGNMENT_ROLE:
+            return ALIGN_CENTER if col != 4 else None
+        if role == ID_ROLE:
+            return acc.id
+        if role == SECRET_ROLE:
+            if col == 0:
+                return acc.username
+            if col == 1:
+                return acc.password
+        if role == RANK_KEY_ROLE:
+            return rank_key(acc.ranked)
+        return None
+
+    @staticmethod
+    def _text(acc, col):
+        if col == 0:
+            return acc.username
+        if col == 1:
+            return acc.password
+        if col == 2:
+            return str(acc.level)
+        if col == 3:
+            return acc.mail
+        if col == 5:
+            return acc.ranked
+        if col == 6:
+            return f"{acc.wins}/{acc.losses}" if acc.level >= 30 else ""
+        if col == 7:
+            return f"{acc.winrate}%" if acc.level >= 30 else ""
+        if col == 8:
+            return acc.riot_id
+        return ""
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.NoItemFlags
+        owner = index.internalPointer()
+        if owner.depth < 2:
+            return READ_ONLY_FLAGS
+        col = index.column()
+        if col not in EDITABLE_FIELDS:
+            return READ_ONLY_FLAGS
+        if col in RANKED_COLUMNS and owner.children[index.row()].level < 30:
+            return READ_ONLY_FLAGS
+        return EDITABLE_FLAGS
+
+    def setData(self, index, value, role=Qt.EditRole):
+        acc = self.account_at(index)
+        if acc is None or role != Qt.EditRole:
+            return False
+        col = index.column()
+        field = EDITABLE_FIELDS.get(col)
+        if field is None:
+            return False
+        text = str(value)
+        if col == 0:
+            if not text.strip():
+                return False
+            fields = {"username": text}
+        elif col == 2:
+            try:
+                fields = {"level": int(text)}
+            except ValueError:
+                return False
+        elif col == 6:
+            try:
+                wins_str, losses_str = text.split("/")
+                wins = int(wins_str)
+                losses = int(losses_str)
+            except ValueError:
+                return False
+            wr = round(wins / (wins + losses) * 100, 1) if (wins + losses) else 0.0
+            fields = {"wins": wins, "losses": losses, "winrate": wr}
+        else:
+            fields = {field: text}
+
+        previous = {name: getattr(acc, name) for name in fields}
+        if previous == fields:
+            return False
+        self.update_account(acc.id, fields)
+        self.account_edited.emit(acc.id, fields, previous)
+        return True
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        """Sort the accounts of every region/type group; groups keep their order."""
+        field = SORT_FIELDS.get(column)
+        if field is None:
+            return
+        self._sort = field
+        self._sort_key = SORT_KEYS[field]
+        self._sort_reverse = order == Qt.DescendingOrder
+        type_nodes = [node for region_node in self._root.children for node in region_node.children]
+        if not all(node.exhausted for node in type_nodes):
+            # The loaded pages are not the top of the new order; page the groups in again
+            self.beginResetModel()
+            for node in type_nodes:
+                for acc in node.children:
+                    del self._by_id[acc.id]
+                node.children = []
+                node._rows = None
+                node.exhausted = False
+                node.cursor = None
+            self.endResetModel()
+            return
+        self.layoutAboutToBeChanged.emit()
+        persistent = self.persistentIndexList()
+        moved = [(index, self.account_at(index)) for index in persistent]
+        for region_node in self._root.children:
+            for type_node in region_node.children:
+                type_node.children.sort(key=self._sort_key, reverse=self._sort_reverse)
+                type_node._rows = None
+        updated = []
+        for index, acc in moved:
+            if acc is None:
+                updated.append(index)
+            else:
+                type_node = index.internalPointer()
+                updated.append(self.createIndex(type_node.row_of(acc), index.column(), type_node))
+        self.changePersistentIndexList(persistent, updated)
+        self.layoutChanged.emit()
+
+    def set_groups(self, groups, search=None):
+        """Replace the tree with empty region/type groups that page their accounts in on demand.
+
+        `groups` holds (region, type) pairs; `search` limits the pages to matching accounts.
+        """
+        self.beginResetModel()
+        self._search = search
+        self._root.children = []
+        self._by_id = {}
+        for region, ttype in sorted(groups):
+            region_node = self._root.children[-1] if self._root.children else None
+            if region_node is None or region_node.name != region:
+                region_node = GroupNode(region, self._root)
+                self._root.children.append(region_node)
+            region_node.children.append(GroupNode(ttype, region_node, exhausted=False))
+        self.endResetModel()
+
+    # Updates
+
+    def update_account(self, acc_id, fields):
+        """Apply changed fields to a loaded account and move it to its new sorted row.
+
+        Returns False when the account is not in the tree; see merge_accounts for those.
+        """
+        entry = self._by_id.get(acc_id)
+        if entry is None:
+            return False
+        type_node, acc = entry
+        old_key = self._sort_key(acc)
+        for name, value in fields.items():
+            setattr(acc, name, value)
+        row = type_node.row_of(acc)
+        parent = self.createIndex(type_node.row(), 0, type_node.parent)
+        self.dataChanged.emit(self.index(row, 0, parent), self.index(row, len(COLUMNS) - 1, parent))
+        if self._sort_key(acc) != old_key:
+            self._reposition(type_node, row, acc)
+        return True
+
+    def _reposition(self, type_node, row, acc):
+        others = type_node.children[:row] + type_node.children[row + 1:]
+        position = self._insert_position(others, acc)
+        if position == row:
+            return
+        parent = self._group_index(type_node)
+        if position == len(others) and not type_node.exhausted:
+            # It now sorts past the loaded pages; a later fetchMore brings it back
+            self.beginRemoveRows(parent, row, row)
+            type_node.children = others
+            type_node._rows = None
+            del self._by_id[acc.id]
+            self.endRemoveRows()
+            return
+        # beginMoveRows counts the destination in rows before the move
+        self.beginMoveRows(parent, row, row, parent, position if position < row else position + 1)
+        others.insert(position, acc)
+        type_node.children = others
+        type_node._rows = None
+        self.endMoveRows()
+
+    def add_account(self, account):
+        type_node = self._find_group(account.region, account.type)
+        if type_node is None:
+            self._insert_group(account.region, account.type, [account])
+            return
+        row = self._insert_position(type_node.children, account)
+        if row == len(type_node.children) and not type_node.exhausted:
+            # Past the loaded pages; it arrives with a later fetchMore
+            return
+        self.beginInsertRows(self._group_index(type_node), row, row)
+        type_node.children.insert(row, account)
+        type_node._rows = None
+        self._by_id[account.id] = (type_node, account)
+        self.endInsertRows()
+
+    def merge_accounts(self, accounts):
+        """Update accounts already in the tree and insert the rest into their groups."""
+        added = {}
+        for acc in accounts:
+            if acc.id in self._by_id:
+                self.update_account(acc.id, {f.name: getattr(acc, f.name) for f in dataclass_fields(acc)})
+            else:
+                added.setdefault((acc.region, acc.type), []).append(acc)
+
+        for (region, ttype), accs in added.items():
+            type_node = self._find_group(region, ttype)
+            if type_node is not None and not type_node.exhausted:
+                # Accounts past the loaded pages arrive with a later fetchMore
+                end = len(type_node.children)
+                accs = [acc for acc in accs if self._insert_position(type_node.children, acc) < end]
+                if not accs:
+                    continue
+            if type_node is None:
+                # A new group pages its accounts in when expanded, like the others
+                self._insert_group(region, ttype)
+            elif len(accs) == 1:
+                self.add_account(accs[0])
+            else:
+                accs.sort(key=self._sort_key, reverse=self._sort_reverse)
+                parent = self._group_index(type_node)
+                end = len(type_node.children)
+                if self._insert_position(type_node.children, accs[0]) == end:
+                    # Everything sorts after the existing rows (a streamed load does): one append
+                    self.beginInsertRows(parent, end, end + len(accs) - 1)
+                    type_node.children.extend(accs)
+                    type_node._rows = None
+                    for acc in accs:
+                        self._by_id[acc.id] = (type_node, acc)
+                    self.endInsertRows()
+                    continue
+                # Re-sorting a whole group is cheaper than one insert signal per account
+                merged = sorted(type_node.children + accs, key=self._sort_key, reverse=self._sort_reverse)
+                if type_node.children:
+                    self.beginRemoveRows(parent, 0, len(type_node.children) - 1)
+                    type_node.children = []
+                    self.endRemoveRows()
+                self.beginInsertRows(parent, 0, len(merged) - 1)
+                type_node.children = merged
+                type_node._rows = None
+                for acc in accs:
+                    self._by_id[acc.id] = (type_node, acc)
+                self.endInsertRows()
+
+    def add_groups(self, groups):
+        """Add empty (region, type) groups that page their accounts in on demand."""
+        for region, ttype in groups:
+            if self._find_group(region, ttype) is None:
+                self._insert_group(region, ttype)
+
+    def remove_account(self, acc_id):
+        entry = self._by_id.pop(acc_id, None)
+        if entry is None:
+            return
+        type_node, acc = entry
+        region_node = type_node.parent
+        if len(type_node.children) > 1 or not type_node.exhausted:
+            row = type_node.row_of(acc)
+            self.beginRemoveRows(self._group_index(type_node), row, row)
+            del type_node.children[row]
+            type_node._rows = None
+            self.endRemoveRows()
+        elif len(region_node.children) > 1:
+            row = type_node.row()
+            self.beginRemoveRows(self._group_index(region_node), row, row)
+            del region_node.children[row]
+            self.endRemoveRows()
+        else:
+            row = region_node.row()
+            self.beginRemoveRows(QModelIndex(), row, row)
+            del self._root.children[row]
+            self.endRemoveRows()
+
+    def clear(self):
+        self.beginResetModel()
+        self._root.children = []
+        self._by_id = {}
+        self.endResetModel()
+
+    def _group_index(self, node):
+        if node is self._root:
+            return QModelIndex()
+        return self.createIndex(node.row(), 0, node.parent)
+
+    def _find_group(self, region, ttype):
+        for region_node in self._root.children:
+            if region_node.name == region:
+                for type_node in region_node.children:
+                    if type_node.name == ttype:
+                        return type_node
+        return None
+
+    def _insert_group(self, region, ttype, accounts=None):
+        # Without `accounts` the group starts empty and is paged in through fetchMore
+        region_node = next((node for node in self._root.children if node.name == region), None)
+        new_region = region_node is None
+        if new_region:
+            region_node = GroupNode(region, self._root)
+        type_node = GroupNode(ttype, region_node, exhausted=accounts is not None)
+        type_node.children = sorted(accounts or (), key=self._sort_key, reverse=self._sort_reverse)
+        for acc in type_node.children:
+            self._by_id[acc.id] = (type_node, acc)
+
+        # Groups stay in name order whatever order their accounts arrive in
+        if new_region:
+            region_node.children.append(type_node)
+            row = bisect([node.name for node in self._root.children], region)
+            self.beginInsertRows(QModelIndex(), row, row)
+            self._root.children.insert(row, region_node)
+            self.endInsertRows()
+        else:
+            row = bisect([node.name for node in region_node.children], ttype)
+            self.beginInsertRows(self._group_index(region_node), row, row)
+            region_node.children.insert(row, type_node)
+            self.endInsertRows()
+
+    def _insert_position(self, children, account):
+        # Binary search that honours the current sort direction
+        key = self._sort_key(account)
+        lo, hi = 0, len(children)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            other = self._sort_key(children[mid])
+            if (other >= key) if self._sort_reverse else (other <= key):
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
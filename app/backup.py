@@ -0,0 +1,268 @@
+# app/backup.py
+import csv
+import gzip
+import hashlib
+import json
+import os
+import shutil
+import sqlite3
+import threading
+import zlib
+from datetime import date, datetime
+
+from PySide6.QtCore import QThread, Signal
+
+from app.database import ACCOUNT_FIELDS
+
+EXPORTS_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "exports")
+STATE_FILE = "backup_state.json"
+BACKUP_COLUMNS = ("id",) + ACCOUNT_FIELDS
+SELECT_BACKUP_ROWS = f"SELECT {', '.join(BACKUP_COLUMNS)} FROM accounts ORDER BY id"
+
+SNAPSHOTS_DIR = "snapshots"
+MANIFEST_FILE = "manifest.json"
+# Copy the database a few pages at a time so UI writes can slip in between steps
+BACKUP_PAGES_PER_STEP = 256
+BACKUP_STEP_SLEEP = 0.005
+# Newest snapshot kept per bucket: last 7 days, last 4 ISO weeks, last 12 months
+RETENTION = (
+    (lambda day: day, 7),
+    (lambda day: day.isocalendar()[:2], 4),
+    (lambda day: (day.year, day.month), 12),
+)
+CHUNK_SIZE = 1024 * 1024
+
+
+class BackupCancelled(Exception):
+    """Raised from inside a backup once BackupThread.cancel() was called."""
+
+
+def _never_cancelled():
+    pass
+
+
+def database_checksum(db, check_cancelled=_never_cancelled):
+    digest = hashlib.sha256()
+    cursor = db.conn.execute(SELECT_BACKUP_ROWS)
+    for row in cursor:
+        check_cancelled()
+        digest.update(repr(tuple(row)).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def _load_state(exports_dir):
+    try:
+        with open(os.path.join(exports_dir, STATE_FILE), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_state(exports_dir, state):
+    path = os.path.join(exports_dir, STATE_FILE)
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(state, f)
+    os.replace(path + ".tmp", path)
+
+
+def _write_csv(db, path, check_cancelled=_never_cancelled):
+    with open(path, "w", newline="", encoding="utf-8-sig") as f:
+        writer = csv.writer(f)
+        writer.writerow(ACCOUNT_FIELDS)
+        for row in db.conn.execute(SELECT_BACKUP_ROWS):
+            check_cancelled()
+            writer.writerow(tuple(row)[1:])
+
+
+def _write_json(db, path, check_cancelled=_never_cancelled):
+    # Same layout as json.dump(list, indent=4), written one account at a time
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("[")
+        first = True
+        for row in db.conn.execute(SELECT_BACKUP_ROWS):
+            check_cancelled()
+            entry = json.dumps(dict(zip(BACKUP_COLUMNS, row)), indent=4, ensure_ascii=False)
+            f.write("\n" if first else ",\n")
+            f.write("    " + entry.replace("\n", "\n    "))
+            first = False
+        f.write("\n]" if not first else "]")
+
+
+def file_crc32(path):
+    crc = 0
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            crc = zlib.crc32(chunk, crc)
+    return crc
+
+
+class SnapshotStore:
+    """Gzipped SQLite snapshots with a CRC manifest and daily/weekly/monthly retention."""
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.manifest_path = os.path.join(directory, MANIFEST_FILE)
+
+    def load_manifest(self):
+        try:
+            with open(self.manifest_path, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_manifest(self, manifest):
+        with open(self.manifest_path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=4)
+        os.replace(self.manifest_path + ".tmp", self.manifest_path)
+
+    def save(self, db, checksum, day=None, check_cancelled=_never_cancelled):
+        """Snapshot the database unless the newest snapshot already holds this data."""
+        os.makedirs(self.directory, exist_ok=True)
+        day = day or date.today()
+        name = f"{day.isoformat()}.db.gz"
+        manifest = self.load_manifest()
+        latest = max(manifest, default=None)
+        if latest and manifest[latest].get("data_checksum") == checksum:
+            return False
+
+        path = os.path.join(self.directory, name)
+        raw_path = path + ".raw"
+        target = sqlite3.connect(raw_path)
+        try:
+            db.conn.backup(
+                target, pages=BACKUP_PAGES_PER_STEP, sleep=BACKUP_STEP_SLEEP,
+                progress=lambda *_: check_cancelled(),
+            )
+        except BaseException:
+            target.close()
+            os.remove(raw_path)
+            raise
+        target.close()
+        try:
+            with open(raw_path, "rb") as src, gzip.open(path + ".tmp", "wb") as dst:
+                shutil.copyfileobj(src, dst, CHUNK_SIZE)
+        finally:
+            os.remove(raw_path)
+        os.replace(path + ".tmp", path)
+
+        manifest[name] = {
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "size": os.path.getsize(path),
+            "crc32": file_crc32(path),
+            "data_checksum": checksum,
+        }
+        self._save_manifest(self.prune(manifest))
+        return True
+
+    def verify(self):
+        """Return the snapshots whose file is missing or fails its CRC check."""
+        failed = []
+        for name, entry in sorted(self.load_manifest().items()):
+            path = os.path.join(self.directory, name)
+            try:
+                ok = os.path.getsize(path) == entry["size"] and file_crc32(path) == entry["crc32"]
+            except (OSError, KeyError):
+                ok = False
+            if not ok:
+                failed.append(name)
+        return failed
+
+    def prune(self, manifest):
+        days = {}
+        for name in manifest:
+            try:
+                days[name] = date.fromisoformat(name.split(".")[0])
+            except ValueError:
+                continue
+        newest_first = sorted(days, key=days.get, reverse=True)
+        keep = set()
+        for bucket_of, limit in RETENTION:
+            buckets = set()
+            for name in newest_first:
+                bucket = bucket_of(days[name])
+                if bucket in buckets:
+                    continue
+                if len(buckets) == limit:
+                    break
+                buckets.add(bucket)
+                keep.add(name)
+        for name in set(days) - keep:
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except OSError:
+                pass
+            del manifest[name]
+        return manifest
+
+
+def run_backup(db, exports_dir=EXPORTS_DIR, check_cancelled=_never_cancelled):
+    """Export today's CSV/JSON backup and a snapshot unless nothing changed. Returns True if written.
+
+    check_cancelled() is called between rows and copy steps and may raise BackupCancelled.
+    """
+    os.makedirs(exports_dir, exist_ok=True)
+    checksum = database_checksum(db, check_cancelled)
+    snapshot_written = SnapshotStore(os.path.join(exports_dir, SNAPSHOTS_DIR)).save(
+        db, checksum, check_cancelled=check_cancelled
+    )
+    return _export_daily(db, exports_dir, checksum, check_cancelled) or snapshot_written
+
+
+def _export_daily(db, exports_dir, checksum, check_cancelled):
+    today = date.today().strftime("%d-%m-%Y")
+    csv_path = os.path.join(exports_dir, f"{today}.csv")
+    json_path = os.path.join(exports_dir, f"{today}.json")
+
+    state = _load_state(exports_dir)
+    if (
+        state.get("checksum") == checksum
+        and state.get("date") == today
+        and os.path.exists(csv_path)
+        and os.path.exists(json_path)
+    ):
+        return False
+
+    for path, write in ((csv_path, _write_csv), (json_path, _write_json)):
+        try:
+            write(db, path + ".tmp", check_cancelled)
+        except BackupCancelled:
+            os.remove(path + ".tmp")
+            raise
+        os.replace(path + ".tmp", path)
+    _save_state(exports_dir, {"date": today, "checksum": checksum})
+    return True
+
+
+class BackupThread(QThread):
+    backup_done = Signal(bool)
+    # Snapshot names that failed CRC validation
+    verification_failed = Signal(list)
+
+    def __init__(self, db, exports_dir=EXPORTS_DIR):
+        super().__init__()
+        self.db = db
+        self.exports_dir = exports_dir
+        self._cancelled = threading.Event()
+
+    def cancel(self):
+        """Stop at the next row or copy step; the partial backup is discarded."""
+        self._cancelled.set()
+
+    def _check_cancelled(self):
+        if self._cancelled.is_set():
+            raise BackupCancelled
+
+    def run(self):
+        written = False
+        try:
+            failed = SnapshotStore(os.path.join(self.exports_dir, SNAPSHOTS_DIR)).verify()
+            if failed:
+                self.verification_failed.emit(failed)
+            written = run_backup(self.db, self.exports_dir, self._check_cancelled)
+        except BackupCancelled:
+            print("[Backup] Cancelled")
+        except (OSError, ValueError, sqlite3.Error) as e:
+            print(f"[Backup] Error: {e}")
+        finally:
+            self.db.close_thread_connection()
+        self.backup_done.emit(written)
@@ -1,11 +1,141 @@
 # app/database.py
 import sqlite3
 import os
+import re
+import string
+import threading
+import time
 from dataclasses import dataclass
+from functools import lru_cache
 
 DB_PATH = os.path.join(os.path.dirname(__file__), "accounts.db")
+# A Riot ID can be renamed or taken over, so resolved ids are only trusted for a week
+RIOT_ID_CACHE_TTL = 7 * 24 * 3600
+# Riot sync skips accounts synced more recently than this unless forced
+SYNC_STALE_AFTER = 6 * 3600
+# Accounts whose Riot data changed this recently count as active and are synced as if
+# they were ACTIVE_SYNC_BOOST staler than they are
+ACTIVE_SYNC_WINDOW = 7 * 24 * 3600
+ACTIVE_SYNC_BOOST = 24 * 3600
+# Sync bookkeeping, unix times; NULL until the first sync
+SYNC_COLUMNS = ("last_synced_at", "last_changed_at")
+# Sync runs that stopped early and are picked up again on the next launch
+RESUMABLE_SYNC_STATUSES = "('running', 'interrupted')"
+# Applied to every pooled connection; WAL lets background readers run next to UI writes
+CONNECTION_PRAGMAS = (
+    "PRAGMA journal_mode = WAL",
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA cache_size = -16000",
+    "PRAGMA mmap_size = 134217728",
+)
+BUSY_TIMEOUT = 10
+STATEMENT_CACHE_SIZE = 256
+# Accounts per fetchMore page when a group is expanded or scrolled
+PAGE_SIZE = 500
+# Ids per IN (...) lookup, below SQLite's host parameter limit
+ID_BATCH_SIZE = 500
 
-@dataclass
+ACCOUNT_FIELDS = (
+    "region", "type", "username", "password", "level", "mail",
+    "ranked", "wins", "losses", "winrate", "riot_id",
+)
+
+# Every copy of a (region, username) except the newest one
+DUPLICATE_ROWS = "id NOT IN (SELECT MAX(id) FROM accounts GROUP BY region, username)"
+
+# How imports treat a row whose (region, username) already exists
+CONFLICT_POLICIES = {
+    "skip": "DO NOTHING",
+    "update": (
+        "DO UPDATE SET level = excluded.level, ranked = excluded.ranked, wins = excluded.wins, "
+        "losses = excluded.losses, winrate = excluded.winrate, rank_score = excluded.rank_score"
+    ),
+    "replace": (
+        "DO UPDATE SET password = excluded.password, level = excluded.level, mail = excluded.mail, "
+        "ranked = excluded.ranked, wins = excluded.wins, losses = excluded.losses, "
+        "winrate = excluded.winrate, riot_id = excluded.riot_id, rank_score = excluded.rank_score"
+    ),
+}
+
+# Lowest to highest; the index + 1 is the tier part of rank_score, unranked is 0
+TIERS = ("I", "B", "S", "G", "P", "E", "D", "M", "GM", "C")
+DIVISIONS = ("IV", "III", "II", "I")
+# "GII/45LP", "GM 320LP", "D IV / 0 LP"
+RANK_PATTERN = re.compile(r"^(GM|[IBSGPEDMC])\s*(IV|III|II|I)?(?![A-Z])\s*/?\s*(\d+)?")
+# Sortable columns: sort name -> ORDER BY expression, each backed by a (region, type, ...) index
+SORT_EXPRESSIONS = {
+    "username": "username COLLATE NOCASE",
+    "level": "level",
+    "rank": "rank_score",
+    "wins": "wins",
+    "winrate": "winrate",
+}
+# Folds like the NOCASE collation above, for sorting rows in Python
+NOCASE_TABLE = str.maketrans(string.ascii_uppercase, string.ascii_lowercase)
+
+# Batches at least this large skip the per-row search index trigger and are indexed in one pass
+FTS_BULK_INSERT_ROWS = 1000
+# Columns the search box matches against
+SEARCH_FIELDS = ("username", "mail", "riot_id", "ranked")
+# The trigram tokenizer cannot match anything shorter than this, so LIKE handles those queries
+FTS_MIN_QUERY = 3
+FTS_SCHEMA = (
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS accounts_fts USING fts5(
+        {", ".join(SEARCH_FIELDS)}, content = 'accounts', content_rowid = 'id', tokenize = 'trigram'
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS accounts_fts_insert AFTER INSERT ON accounts BEGIN
+        INSERT INTO accounts_fts (rowid, {", ".join(SEARCH_FIELDS)})
+        VALUES (new.id, {", ".join("new." + name for name in SEARCH_FIELDS)});
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS accounts_fts_delete AFTER DELETE ON accounts BEGIN
+        INSERT INTO accounts_fts (accounts_fts, rowid, {", ".join(SEARCH_FIELDS)})
+        VALUES ('delete', old.id, {", ".join("old." + name for name in SEARCH_FIELDS)});
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS accounts_fts_update
+    AFTER UPDATE OF {", ".join(SEARCH_FIELDS)} ON accounts BEGIN
+        INSERT INTO accounts_fts (accounts_fts, rowid, {", ".join(SEARCH_FIELDS)})
+        VALUES ('delete', old.id, {", ".join("old." + name for name in SEARCH_FIELDS)});
+        INSERT INTO accounts_fts (rowid, {", ".join(SEARCH_FIELDS)})
+        VALUES (new.id, {", ".join("new." + name for name in SEARCH_FIELDS)});
+    END
+    """,
+)
+
+
+def nocase_key(text: str) -> str:
+    """Python sort key for SQLite's NOCASE collation, which only folds ASCII letters."""
+    return text.translate(NOCASE_TABLE)
+
+
+def like_pattern(text: str) -> str:
+    escaped = text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+@lru_cache(maxsize=4096)
+def rank_score(ranked: str) -> int:
+    """Tier-aware sort key for a ranked string: tier, then division, then LP."""
+    match = RANK_PATTERN.match((ranked or "").strip().upper())
+    if match is None:
+        return 0
+    tier, division, lp = match.groups()
+    # Apex tiers have no division; they rank as division I
+    division_score = DIVISIONS.index(division) + 1 if division else len(DIVISIONS)
+    return (TIERS.index(tier) + 1) * 100000 + division_score * 10000 + min(int(lp or 0), 9999)
+
+
+def riot_id_key(riot_id: str) -> str:
+    return riot_id.strip().lower()
+
+@dataclass(slots=True)
 class Account:
     id: int = None
     region: str = ""
@@ -20,16 +150,67 @@ class Account:
     winrate: float = 0.0
     riot_id: str = ""
 
+INSERT_ACCOUNT_SQL = """
+    INSERT INTO accounts (
+        region, type, username, password, level, mail, ranked, wins, losses, winrate, riot_id, rank_score
+    )
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+
+def account_params(account: Account):
+    return tuple(getattr(account, name) for name in ACCOUNT_FIELDS) + (rank_score(account.ranked),)
+
+
+def row_to_account(row) -> Account:
+    return Account(row["id"], *(row[name] for name in ACCOUNT_FIELDS))
+
 class DatabaseManager:
+    """Account repository shared by the UI and worker threads.
+
+    Each thread gets its own pooled connection on first use, so one instance
+    can be handed to LoadThread, RiotUpdateThread and the importers.
+    """
+
     def __init__(self, db_path=DB_PATH):
         self.db_path = db_path
-        self._connect()
+        self._local = threading.local()
+        self.fts_enabled = False
+        # Rows moved to accounts_duplicates when the unique index was first created
+        self.moved_duplicates = 0
         self._create_tables()
 
     def _connect(self):
-        self.conn = sqlite3.connect(self.db_path)
-        self.conn.row_factory = sqlite3.Row
-        self.cursor = self.conn.cursor()
+        conn = sqlite3.connect(
+            self.db_path, timeout=BUSY_TIMEOUT, cached_statements=STATEMENT_CACHE_SIZE
+        )
+        conn.row_factory = sqlite3.Row
+        for pragma in CONNECTION_PRAGMAS:
+            conn.execute(pragma)
+        return conn
+
+    def _thread_connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = self._connect()
+            self._local.cursor = conn.cursor()
+        return conn
+
+    @property
+    def conn(self):
+        return self._thread_connection()
+
+    @property
+    def cursor(self):
+        self._thread_connection()
+        return self._local.cursor
+
+    def close_thread_connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+            self._local.cursor = None
 
     def _create_tables(self):
         self.cursor.execute(
@@ -46,65 +227,373 @@ class DatabaseManager:
                 wins INTEGER,
                 losses INTEGER,
                 winrate REAL,
-                riot_id TEXT
+                riot_id TEXT,
+                rank_score INTEGER NOT NULL DEFAULT 0,
+                last_synced_at REAL,
+                last_changed_at REAL
             )
             """
         )
+        self.cursor.execute("PRAGMA table_info(accounts)")
+        columns = {row["name"] for row in self.cursor.fetchall()}
+        for name in SYNC_COLUMNS:
+            if name not in columns:
+                self.cursor.execute(f"ALTER TABLE accounts ADD COLUMN {name} REAL")
+        if "rank_score" not in columns:
+            self.cursor.execute("ALTER TABLE accounts ADD COLUMN rank_score INTEGER NOT NULL DEFAULT 0")
+            self.cursor.execute("SELECT id, ranked FROM accounts WHERE ranked != ''")
+            self.cursor.executemany(
+                "UPDATE accounts SET rank_score = ? WHERE id = ?",
+                [(rank_score(row["ranked"]), row["id"]) for row in self.cursor.fetchall()],
+            )
+        self.cursor.execute(
+            """
+            CREATE TABLE IF NOT EXISTS riot_id_cache (
+                riot_id TEXT PRIMARY KEY,
+                puuid TEXT NOT NULL,
+                summoner_id TEXT NOT NULL,
+                cached_at REAL NOT NULL
+            )
+            """
+        )
+        # synced_before: accounts last synced after it are done; resuming reuses it
+        self.cursor.execute(
+            """
+            CREATE TABLE IF NOT EXISTS sync_runs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                started_at REAL NOT NULL,
+                finished_at REAL,
+                synced_before REAL NOT NULL,
+                status TEXT NOT NULL,
+                total INTEGER NOT NULL,
+                synced INTEGER NOT NULL
+            )
+            """
+        )
+        self.cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = 'idx_accounts_region_username'"
+        )
+        if self.cursor.fetchone() is None:
+            # Older databases may already hold duplicates; keep the newest copy of each and
+            # move the rest to accounts_duplicates so nothing is lost
+            self.cursor.execute(
+                "CREATE TABLE IF NOT EXISTS accounts_duplicates AS SELECT * FROM accounts WHERE 0"
+            )
+            self.cursor.execute(
+                f"INSERT INTO accounts_duplicates SELECT * FROM accounts WHERE {DUPLICATE_ROWS}"
+            )
+            self.moved_duplicates = self.cursor.rowcount
+            self.cursor.execute(f"DELETE FROM accounts WHERE {DUPLICATE_ROWS}")
+            self.cursor.execute(
+                "CREATE UNIQUE INDEX idx_accounts_region_username ON accounts (region, username)"
+            )
+        for name, expression in SORT_EXPRESSIONS.items():
+            self.cursor.execute(
+                f"CREATE INDEX IF NOT EXISTS idx_accounts_group_{name} ON accounts (region, type, {expression})"
+            )
+        self._create_search_index()
+        self.conn.commit()
+
+    def _create_search_index(self):
+        self.cursor.execute("SELECT 1 FROM sqlite_master WHERE name = 'accounts_fts'")
+        existed = self.cursor.fetchone() is not None
+        try:
+            for statement in FTS_SCHEMA:
+                self.cursor.execute(statement)
+        except sqlite3.OperationalError as e:
+            # SQLite built without FTS5 or the trigram tokenizer; search falls back to LIKE
+            print(f"[Database] Search index unavailable: {e}")
+            self.fts_enabled = False
+            return
+        if not existed:
+            self.cursor.execute("INSERT INTO accounts_fts (accounts_fts) VALUES ('rebuild')")
+        self.fts_enabled = True
+
+    def add_account(self, account: Account) -> int:
+        with self.conn:
+            self.cursor.execute(INSERT_ACCOUNT_SQL, account_params(account))
+        return self.cursor.lastrowid
+
+    def add_accounts(self, accounts, on_conflict=None):
+        """Insert accounts in one transaction and return the number of rows inserted or updated.
+
+        on_conflict is a CONFLICT_POLICIES key; None lets a duplicate raise IntegrityError.
+        """
+        sql = INSERT_ACCOUNT_SQL
+        if on_conflict is not None:
+            sql += f" ON CONFLICT (region, username) {CONFLICT_POLICIES[on_conflict]}"
+        params = [account_params(account) for account in accounts]
+        if not self.fts_enabled or len(params) < FTS_BULK_INSERT_ROWS:
+            with self.conn:
+                self.cursor.executemany(sql, params)
+            return self.cursor.rowcount
+        fields = ", ".join(SEARCH_FIELDS)
+        with self.conn:
+            # DDL does not open a transaction by itself; the trigger is only missing inside this one
+            self.cursor.execute("BEGIN IMMEDIATE")
+            self.cursor.execute("SELECT COALESCE(MAX(id), 0) FROM accounts")
+            max_id = self.cursor.fetchone()[0]
+            self.cursor.execute("DROP TRIGGER accounts_fts_insert")
+            self.cursor.executemany(sql, params)
+            count = self.cursor.rowcount
+            self.cursor.execute(
+                f"INSERT INTO accounts_fts (rowid, {fields}) SELECT id, {fields} FROM accounts WHERE id > ?",
+                (max_id,),
+            )
+            self.cursor.execute(FTS_SCHEMA[1])
+        return count
+
+    def max_account_id(self):
+        self.cursor.execute("SELECT COALESCE(MAX(id), 0) FROM accounts")
+        return self.cursor.fetchone()[0]
+
+    def fetch_accounts_after(self, account_id, groups=None):
+        """Accounts with an id above `account_id`, only from the (region, type) `groups` if given."""
+        if groups is None:
+            self.cursor.execute("SELECT * FROM accounts WHERE id > ?", (account_id,))
+            return [row_to_account(row) for row in self.cursor.fetchall()]
+        accounts = []
+        for region, ttype in groups:
+            self.cursor.execute(
+                "SELECT * FROM accounts WHERE region = ? AND type = ? AND id > ?", (region, ttype, account_id)
+            )
+            accounts.extend(row_to_account(row) for row in self.cursor.fetchall())
+        return accounts
+
+    def fetch_groups_after(self, account_id):
+        """(region, type) groups holding an account with an id above `account_id`."""
+        self.cursor.execute("SELECT DISTINCT region, type FROM accounts WHERE id > ?", (account_id,))
+        return {tuple(row) for row in self.cursor.fetchall()}
+
+    def fetch_accounts_by_keys(self, keys):
+        """Look up accounts by (region, username) through a temporary key table."""
+        self.cursor.execute("CREATE TEMP TABLE IF NOT EXISTS lookup_keys (region TEXT, username TEXT)")
+        self.cursor.execute("DELETE FROM lookup_keys")
+        self.cursor.executemany("INSERT INTO lookup_keys VALUES (?, ?)", keys)
+        self.cursor.execute(
+            "SELECT a.* FROM lookup_keys k JOIN accounts a ON a.region = k.region AND a.username = k.username"
+        )
+        accounts = [row_to_account(row) for row in self.cursor.fetchall()]
+        self.cursor.execute("DELETE FROM lookup_keys")
         self.conn.commit()
+        return accounts
+
+    def fetch_accounts_by_ids(self, ids, search=None):
+        """Look up accounts by id, limited to those matching `search` when it is given."""
+        search_condition, search_params = self._search_condition(search)
+        accounts = []
+        ids = list(ids)
+        for start in range(0, len(ids), ID_BATCH_SIZE):
+            chunk = ids[start:start + ID_BATCH_SIZE]
+            condition = f"id IN ({', '.join('?' * len(chunk))})"
+            if search_condition:
+                condition += f" AND ({search_condition})"
+            self.cursor.execute(f"SELECT * FROM accounts WHERE {condition}", (*chunk, *search_params))
+            accounts.extend(row_to_account(row) for row in self.cursor.fetchall())
+        return accounts
 
-    def add_account(self, account: Account):
+    def count_accounts(self):
+        self.cursor.execute("SELECT COUNT(*) FROM accounts")
+        return self.cursor.fetchone()[0]
+
+    def fetch_riot_targets(self, synced_before):
+        """Accounts not synced since `synced_before`, most urgent first: never synced,
+        then stalest, with recently changed (active) accounts moved up."""
+        now = time.time()
         self.cursor.execute(
             """
-            INSERT INTO accounts (region, type, username, password, level, mail, ranked, wins, losses, winrate, riot_id)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            SELECT id, region, riot_id, level, ranked, wins, losses FROM accounts
+            WHERE riot_id != '' AND (last_synced_at IS NULL OR last_synced_at <= ?)
+            ORDER BY last_synced_at IS NOT NULL,
+                last_synced_at - CASE WHEN last_changed_at >= ? THEN ? ELSE 0 END,
+                id
             """,
-            (
-                account.region,
-                account.type,
-                account.username,
-                account.password,
-                account.level,
-                account.mail,
-                account.ranked,
-                account.wins,
-                account.losses,
-                account.winrate,
-                account.riot_id,
-            ),
+            (synced_before, now - ACTIVE_SYNC_WINDOW, ACTIVE_SYNC_BOOST),
         )
-        self.conn.commit()
+        return self.cursor.fetchall()
+
+    def count_fresh_riot_targets(self, synced_before):
+        self.cursor.execute(
+            "SELECT COUNT(*) FROM accounts WHERE riot_id != '' AND last_synced_at > ?", (synced_before,)
+        )
+        return self.cursor.fetchone()[0]
+
+    def start_sync_run(self, synced_before, total):
+        """Record a new sync run; any unfinished earlier run is superseded by it."""
+        with self.conn:
+            self.cursor.execute(
+                f"UPDATE sync_runs SET status = 'superseded' WHERE status IN {RESUMABLE_SYNC_STATUSES}"
+            )
+            self.cursor.execute(
+                "INSERT INTO sync_runs (started_at, synced_before, status, total, synced) "
+                "VALUES (?, ?, 'running', ?, 0)",
+                (time.time(), synced_before, total),
+            )
+            return self.cursor.lastrowid
+
+    def resumable_sync_run(self):
+        """The latest sync run that stopped before finishing, or None."""
+        self.cursor.execute(
+            f"SELECT * FROM sync_runs WHERE status IN {RESUMABLE_SYNC_STATUSES} ORDER BY id DESC LIMIT 1"
+        )
+        return self.cursor.fetchone()
+
+    def resume_sync_run(self, run_id):
+        with self.conn:
+            self.cursor.execute("UPDATE sync_runs SET status = 'running' WHERE id = ?", (run_id,))
+
+    def save_sync_batch(self, run_id, changes, synced_ids, changed_ids, resolved):
+        """Checkpoint part of a sync run in one transaction: the changed fields, the
+        synced/changed stamps, newly resolved Riot IDs and the run's progress."""
+        now = time.time()
+        with self.conn:
+            self._write_fields(changes)
+            self.cursor.executemany(
+                "UPDATE accounts SET last_synced_at = ? WHERE id = ?", [(now, i) for i in synced_ids]
+            )
+            self.cursor.executemany(
+                "UPDATE accounts SET last_changed_at = ? WHERE id = ?", [(now, i) for i in changed_ids]
+            )
+            self.cursor.executemany(
+                # summoner_id is unused since the sync went PUUID-only; kept for older databases
+                "INSERT OR REPLACE INTO riot_id_cache (riot_id, puuid, summoner_id, cached_at) VALUES (?, ?, '', ?)",
+                [(riot_id_key(riot_id), puuid, now) for riot_id, puuid in resolved.items()],
+            )
+            self.cursor.execute("DELETE FROM riot_id_cache WHERE cached_at < ?", (now - RIOT_ID_CACHE_TTL,))
+            self.cursor.execute(
+                "UPDATE sync_runs SET synced = synced + ? WHERE id = ?", (len(synced_ids), run_id)
+            )
+
+    def finish_sync_run(self, run_id, status):
+        with self.conn:
+            self.cursor.execute(
+                "UPDATE sync_runs SET status = ?, finished_at = ? WHERE id = ?", (status, time.time(), run_id)
+            )
 
     def fetch_accounts(self):
         self.cursor.execute("SELECT * FROM accounts")
         rows = self.cursor.fetchall()
         grouped = {}
         for row in rows:
-            region = row["region"]
-            ttype = row["type"]
-            acc = Account(
-                id=row["id"],
-                region=region,
-                type=ttype,
-                username=row["username"],
-                password=row["password"],
-                level=row["level"],
-                mail=row["mail"],
-                ranked=row["ranked"],
-                wins=row["wins"],
-                losses=row["losses"],
-                winrate=row["winrate"],
-                riot_id=row["riot_id"],
-            )
-            grouped.setdefault(region, {}).setdefault(ttype, []).append(acc)
+            acc = row_to_account(row)
+            grouped.setdefault(acc.region, {}).setdefault(acc.type, []).append(acc)
         return grouped
 
-    def update_field(self, account_id: int, field: str, value):
+    def fetch_group_counts(self, search=None):
+        """Return [(region, type, count)], only counting accounts that match `search` if given."""
+        condition, params = self._search_condition(search)
+        where = f"WHERE {condition}" if condition else ""
         self.cursor.execute(
-            f"UPDATE accounts SET {field} = ? WHERE id = ?", (value, account_id)
+            f"SELECT region, type, COUNT(*) FROM accounts {where} GROUP BY region, type", params
         )
-        self.conn.commit()
+        return [tuple(row) for row in self.cursor.fetchall()]
+
+    def fetch_group_page(self, region, ttype, sort="level", descending=True, after=None, limit=PAGE_SIZE,
+                         search=None):
+        """Fetch the next `limit` accounts of a group after the keyset position `after`.
+
+        Returns (accounts, cursor); pass the cursor back as `after` for the following page.
+        """
+        expression = SORT_EXPRESSIONS[sort]
+        direction = "DESC" if descending else "ASC"
+        conditions = ["region = ?", "type = ?"]
+        params = [region, ttype]
+        if after is not None:
+            # Spelled out rather than as a row-value comparison so SQLite can seek the
+            # (region, type, expression) index instead of rescanning the group
+            op = "<" if descending else ">"
+            conditions.append(f"{expression} {op}= ? AND ({expression} {op} ? OR id {op} ?)")
+            sort_value, account_id = after
+            params.extend((sort_value, sort_value, account_id))
+        search_condition, search_params = self._search_condition(search)
+        if search_condition:
+            conditions.append(search_condition)
+            params.extend(search_params)
+        self.cursor.execute(
+            f"SELECT *, {expression} AS sort_value FROM accounts WHERE {' AND '.join(conditions)} "
+            f"ORDER BY {expression} {direction}, id {direction} LIMIT ?",
+            (*params, limit),
+        )
+        rows = self.cursor.fetchall()
+        if not rows:
+            return [], after
+        return [row_to_account(row) for row in rows], (rows[-1]["sort_value"], rows[-1]["id"])
+
+    def _search_condition(self, text):
+        """SQL condition and parameters matching accounts whose searchable fields contain `text`."""
+        text = (text or "").strip()
+        if not text:
+            return "", ()
+        if self.fts_enabled and len(text) >= FTS_MIN_QUERY:
+            phrase = '"' + text.replace('"', '""') + '"'
+            return "id IN (SELECT rowid FROM accounts_fts WHERE accounts_fts MATCH ?)", (phrase,)
+        condition = " OR ".join(f"{name} LIKE ? ESCAPE '\\'" for name in SEARCH_FIELDS)
+        return f"({condition})", (like_pattern(text),) * len(SEARCH_FIELDS)
+
+    def search_account_ids(self, text):
+        """Return the ids of accounts whose searchable fields contain `text`, case-insensitively."""
+        condition, params = self._search_condition(text)
+        self.cursor.execute(f"SELECT id FROM accounts WHERE {condition or 1}", params)
+        return {row[0] for row in self.cursor.fetchall()}
+
+    def update_field(self, account_id: int, field: str, value):
+        self.update_fields([(account_id, {field: value})])
+
+    def update_fields(self, changes):
+        """Apply many (account_id, {field: value}) changes in a single transaction.
+
+        Changing riot_id drops the cached resolutions of the old and new Riot ID in the
+        same transaction.
+        """
+        with self.conn:
+            for account_id, fields in changes:
+                if "riot_id" in fields:
+                    self._invalidate_riot_id_cache(account_id, fields["riot_id"])
+            self._write_fields(changes)
+
+    def _write_fields(self, changes):
+        batches = {}
+        for account_id, fields in changes:
+            if not fields:
+                continue
+            for name in fields:
+                if name not in ACCOUNT_FIELDS:
+                    raise ValueError(f"Unknown account field: {name}")
+            if "ranked" in fields:
+                fields = {**fields, "rank_score": rank_score(fields["ranked"])}
+            names = tuple(sorted(fields))
+            batches.setdefault(names, []).append(
+                tuple(fields[name] for name in names) + (account_id,)
+            )
+        for names, params in batches.items():
+            assignments = ", ".join(f"{name} = ?" for name in names)
+            self.cursor.executemany(
+                f"UPDATE accounts SET {assignments} WHERE id = ?", params
+            )
+
+    def delete_account(self, account_id: int):
+        with self.conn:
+            self.cursor.execute("DELETE FROM accounts WHERE id = ?", (account_id,))
 
     def delete_all(self):
+        self.cursor.execute("DROP TABLE IF EXISTS accounts_fts")
         self.cursor.execute("DROP TABLE IF EXISTS accounts")
         self.conn.commit()
-        self._create_tables()
\ No newline at end of file
+        self._create_tables()
+
+    def fetch_riot_id_cache(self, ttl=RIOT_ID_CACHE_TTL):
+        self.cursor.execute(
+            "SELECT riot_id, puuid FROM riot_id_cache WHERE cached_at >= ?",
+            (time.time() - ttl,),
+        )
+        return {row["riot_id"]: row["puuid"] for row in self.cursor.fetchall()}
+
+    def _invalidate_riot_id_cache(self, account_id: int, new_riot_id: str = ""):
+        self.cursor.execute(
+            "SELECT riot_id FROM accounts WHERE id = ?", (account_id,)
+        )
+        row = self.cursor.fetchone()
+        keys = {riot_id_key(new_riot_id)}
+        if row and row["riot_id"]:
+            keys.add(riot_id_key(row["riot_id"]))
+        self.cursor.executemany("DELETE FROM riot_id_cache WHERE riot_id = ?", [(k,) for k in keys])
@@ -90,13 +90,19 @@ class AccountDialog(QDialog):
             riot_id=self.riot_le.text().strip()
         )
 
+CONFLICT_CHOICES = [
+    ("Skip duplicates", "skip"),
+    ("Update stats of duplicates", "update"),
+    ("Replace duplicates", "replace"),
+]
+
 class BulkImportPreviewDialog(QDialog):
-    def __init__(self, rows: list, parent=None):
+    def __init__(self, rows: list, parent=None, title="CSV Preview (first 10 rows)"):
         """
-        rows: list of dicts representing the first 10 CSV rows.
+        rows: list of dicts representing the first 10 imported rows.
         """
         super().__init__(parent)
-        self.setWindowTitle("CSV Preview (first 10 rows)")
+        self.setWindowTitle(title)
         self.rows = rows
 
         main_layout = QVBoxLayout(self)
@@ -120,7 +126,17 @@ class BulkImportPreviewDialog(QDialog):
 
         main_layout.addWidget(table)
 
+        policy_layout = QFormLayout()
+        self.policy_cb = QComboBox()
+        for label, policy in CONFLICT_CHOICES:
+            self.policy_cb.addItem(label, policy)
+        policy_layout.addRow("Existing region + username:", self.policy_cb)
+        main_layout.addLayout(policy_layout)
+
         btns = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
         btns.accepted.connect(self.accept)
         btns.rejected.connect(self.reject)
-        main_layout.addWidget(btns)
\ No newline at end of file
+        main_layout.addWidget(btns)
+
+    def conflict_policy(self) -> str:
+        return self.policy_cb.currentData()
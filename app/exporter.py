@@ -0,0 +1,35 @@
+# app/exporter.py
+import csv
+import json
+from dataclasses import asdict
+
+EXPORT_CSV_HEADER = ["Username", "Password", "Level", "Email", "Ranked", "Wins/Losses", "Winrate", "Riot ID"]
+
+
+def iter_accounts(db):
+    for types in db.fetch_accounts().values():
+        for accs in types.values():
+            yield from accs
+
+
+def export_csv(db, path):
+    with open(path, "w", newline="", encoding="utf-8-sig") as f:
+        writer = csv.writer(f)
+        writer.writerow(EXPORT_CSV_HEADER)
+        for acc in iter_accounts(db):
+            writer.writerow([
+                acc.username,
+                acc.password,
+                acc.level,
+                acc.mail,
+                acc.ranked,
+                f"{acc.wins}/{acc.losses}",
+                f"{acc.winrate}%",
+                acc.riot_id
+            ])
+
+
+def export_json(db, path):
+    flat = [asdict(acc) for acc in iter_accounts(db)]
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(flat, f, indent=4, ensure_ascii=False)
@@ -0,0 +1,161 @@
+# app/importer.py
+import codecs
+import csv
+import json
+import sqlite3
+from itertools import islice
+
+from PySide6.QtCore import QThread, Signal
+
+from app.database import Account
+
+ENCODINGS = ("utf-8-sig", "utf-8", "cp1250", "latin-1")
+SAMPLE_SIZE = 64 * 1024
+CHUNK_SIZE = 10000
+
+
+def detect_encoding(path):
+    with open(path, "rb") as f:
+        sample = f.read(SAMPLE_SIZE)
+    if sample.startswith(codecs.BOM_UTF8):
+        return "utf-8-sig"
+    for enc in ENCODINGS[1:]:
+        try:
+            # Incremental decode so a multi-byte character cut at the end of the sample is fine
+            codecs.getincrementaldecoder(enc)().decode(sample, final=False)
+            return enc
+        except UnicodeDecodeError:
+            continue
+    return ENCODINGS[-1]
+
+
+def iter_csv_rows(path, encoding):
+    with open(path, newline="", encoding=encoding) as f:
+        yield from csv.DictReader(f)
+
+
+def csv_row_to_account(row) -> Account:
+    username = (row.get("username") or "").strip()
+    if not username:
+        raise ValueError("missing username")
+    wins = int(row.get("wins", 0) or 0)
+    losses = int(row.get("losses", 0) or 0)
+    wr_str = (row.get("winrate") or "").strip().rstrip("%")
+    winrate = (
+        float(wr_str)
+        if wr_str
+        else (wins / (wins + losses) * 100 if (wins + losses) else 0.0)
+    )
+    return Account(
+        region=row.get("region", "") or "",
+        type=row.get("type", "") or "",
+        username=username,
+        password=row.get("password", "") or "",
+        level=int(row.get("level", 0) or 0),
+        mail=row.get("mail", "") or "",
+        ranked=row.get("ranked", "") or "",
+        wins=wins,
+        losses=losses,
+        winrate=round(winrate, 1),
+        riot_id=row.get("riot_id", "") or "",
+    )
+
+
+def entry_to_account(entry) -> Account:
+    entry = dict(entry)
+    entry.pop("id", None)
+    username = entry.get("username")
+    if not isinstance(username, str) or not username.strip():
+        raise ValueError("missing username")
+    for name in ("region", "type", "password", "mail", "ranked", "riot_id"):
+        value = entry.get(name)
+        if value is None:
+            entry[name] = ""
+        elif not isinstance(value, str):
+            raise ValueError(f"{name} must be text")
+    for name in ("level", "wins", "losses"):
+        entry[name] = int(entry.get(name) or 0)
+    winrate = entry.get("winrate")
+    if winrate is None or winrate == "":
+        games = entry["wins"] + entry["losses"]
+        winrate = entry["wins"] / games * 100 if games else 0.0
+    entry["winrate"] = round(float(str(winrate).strip().rstrip("%")), 1)
+    entry["username"] = username.strip()
+    return Account(**entry)
+
+
+class ImportThread(QThread):
+    progress = Signal(int)
+    # inserted, updated, duplicates skipped, invalid rows
+    imported = Signal(int, int, int, int)
+    # Accounts inserted or updated by the import in groups that existed before it, for
+    # patching the live model; groups the import created arrive as (region, type) pairs
+    # and page their accounts in like any other group
+    accounts_changed = Signal(object)
+    groups_added = Signal(list)
+    failed = Signal(str)
+
+    def __init__(self, db, label, iter_entries, to_account, on_conflict="skip"):
+        """iter_entries() opens the source and yields raw entries; to_account(entry) turns one
+        into an Account or raises ValueError/TypeError/AttributeError for an invalid row."""
+        super().__init__()
+        self.db = db
+        self.label = label
+        self.iter_entries = iter_entries
+        self.to_account = to_account
+        self.on_conflict = on_conflict
+
+    def run(self):
+        db = self.db
+        before = db.count_accounts()
+        max_id = db.max_account_id()
+        groups_before = {(region, ttype) for region, ttype, _ in db.fetch_group_counts()}
+        updated_keys = []
+        valid = changed = invalid = 0
+        try:
+            entries = self.iter_entries()
+            while True:
+                chunk = list(islice(entries, CHUNK_SIZE))
+                if not chunk:
+                    break
+                accounts = []
+                for entry in chunk:
+                    try:
+                        accounts.append(self.to_account(entry))
+                    except (ValueError, TypeError, AttributeError):
+                        invalid += 1
+                changed += db.add_accounts(accounts, self.on_conflict)
+                if self.on_conflict != "skip":
+                    updated_keys.extend((acc.region, acc.username) for acc in accounts)
+                valid += len(accounts)
+                self.progress.emit(valid)
+        except (OSError, ValueError, UnicodeDecodeError, csv.Error, sqlite3.Error) as e:
+            print(f"[{self.label}] Error: {e}")
+            self.failed.emit(f"{self.label} stopped after {valid} rows: {e}")
+        inserted = db.count_accounts() - before
+        groups = db.fetch_groups_after(max_id)
+        changed_accounts = db.fetch_accounts_after(max_id, groups & groups_before)
+        if updated_keys and changed > inserted:
+            changed_accounts += [acc for acc in db.fetch_accounts_by_keys(updated_keys) if acc.id <= max_id]
+        db.close_thread_connection()
+        self.groups_added.emit(sorted(groups - groups_before))
+        self.accounts_changed.emit(changed_accounts)
+        self.imported.emit(inserted, changed - inserted, valid - changed, invalid)
+
+
+def iter_json_entries(path):
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    if not isinstance(data, list):
+        raise ValueError("expected a list of accounts")
+    return iter(data)
+
+
+def csv_import_thread(db, path, encoding, on_conflict="skip"):
+    return ImportThread(
+        db, "Import CSV", lambda: iter_csv_rows(path, encoding), csv_row_to_account, on_conflict
+    )
+
+
+def json_import_thread(db, path, on_conflict="skip"):
+    return ImportThread(db, "Import JSON", lambda: iter_json_entries(path), entry_to_account, on_conflict)
@@ -1,42 +1,20 @@
 # app/load.py
-import sqlite3
 from PySide6.QtCore import QThread, Signal
-from app.database import DB_PATH, Account
 
 class LoadThread(QThread):
-    accounts_loaded = Signal(object)
+    """Reads the region/type groups; the accounts themselves are paged in by the model."""
 
-    def __init__(self, db_path=DB_PATH):
+    # [(region, type, count)]
+    groups_loaded = Signal(object)
+
+    def __init__(self, db, search=None):
         super().__init__()
-        self.db_path = db_path
+        self.db = db
+        self.search = search
 
     def run(self):
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
-
-        cursor.execute("SELECT * FROM accounts")
-        rows = cursor.fetchall()
-        conn.close()
-
-        grouped = {}
-        for row in rows:
-            region = row["region"]
-            ttype = row["type"]
-            acc = Account(
-                id=row["id"],
-                region=region,
-                type=ttype,
-                username=row["username"],
-                password=row["password"],
-                level=row["level"],
-                mail=row["mail"],
-                ranked=row["ranked"],
-                wins=row["wins"],
-                losses=row["losses"],
-                winrate=row["winrate"],
-                riot_id=row["riot_id"],
-            )
-            grouped.setdefault(region, {}).setdefault(ttype, []).append(acc)
-
-        self.accounts_loaded.emit(grouped)
\ No newline at end of file
+        try:
+            groups = self.db.fetch_group_counts(self.search)
+        finally:
+            self.db.close_thread_connection()
+        self.groups_loaded.emit(groups)
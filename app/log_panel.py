@@ -0,0 +1,142 @@
+# app/log_panel.py
+import time
+
+from PySide6.QtCore import Qt, QTimer, Signal
+from PySide6.QtWidgets import (
+    QDockWidget, QFileDialog, QHBoxLayout, QHeaderView, QLabel, QPlainTextEdit, QPushButton,
+    QTableWidget, QTableWidgetItem, QVBoxLayout, QWidget
+)
+
+# How often the panel re-reads the telemetry of a running sync
+REFRESH_MS = 500
+MAX_LOG_LINES = 5000
+ENDPOINT_COLUMNS = ("Endpoint", "Requests", "Statuses", "Retries", "p50 ms", "p90 ms", "p99 ms", "Max ms")
+
+
+class LogPanel(QDockWidget):
+    """Dockable view of the Riot sync telemetry: per-endpoint latency and status counts,
+    rate limit headroom, skipped accounts and a running log."""
+
+    # Sync again; accounts that failed were not stamped, so a normal sync retries exactly those
+    retry_requested = Signal()
+
+    def __init__(self, parent=None):
+        super().__init__("Status & Logs", parent)
+        self.setObjectName("LogPanel")
+        self.telemetry = None
+        self._event_index = 0
+        self._timer = QTimer(self)
+        self._timer.setInterval(REFRESH_MS)
+        self._timer.timeout.connect(self.refresh)
+
+        body = QWidget()
+        layout = QVBoxLayout(body)
+
+        self.endpoints = QTableWidget(0, len(ENDPOINT_COLUMNS))
+        self.endpoints.setHorizontalHeaderLabels(ENDPOINT_COLUMNS)
+        self.endpoints.verticalHeader().setVisible(False)
+        self.endpoints.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.endpoints.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+        self.endpoints.horizontalHeader().setSectionResizeMode(2, QHeaderView.Stretch)
+        layout.addWidget(self.endpoints)
+
+        self.summary = QLabel("No sync yet")
+        self.summary.setWordWrap(True)
+        self.summary.setTextInteractionFlags(Qt.TextSelectableByMouse)
+        layout.addWidget(self.summary)
+
+        self.log = QPlainTextEdit()
+        self.log.setReadOnly(True)
+        self.log.setMaximumBlockCount(MAX_LOG_LINES)
+        layout.addWidget(self.log)
+
+        buttons = QHBoxLayout()
+        self.retry_btn = QPushButton("Retry Failed")
+        self.retry_btn.setEnabled(False)
+        self.retry_btn.clicked.connect(self.retry_requested.emit)
+        buttons.addWidget(self.retry_btn)
+        self.export_btn = QPushButton("Export JSON")
+        self.export_btn.setEnabled(False)
+        self.export_btn.clicked.connect(self.export_json)
+        buttons.addWidget(self.export_btn)
+        clear_btn = QPushButton("Clear Log")
+        clear_btn.clicked.connect(self.log.clear)
+        buttons.addWidget(clear_btn)
+        buttons.addStretch()
+        layout.addLayout(buttons)
+
+        self.setWidget(body)
+
+    def watch(self, telemetry):
+        """Follow a sync that is starting."""
+        self.telemetry = telemetry
+        self._event_index = 0
+        self.retry_btn.setEnabled(False)
+        self.export_btn.setEnabled(True)
+        self._timer.start()
+        self.refresh()
+
+    def stop_watching(self):
+        """The sync ended; show its final numbers."""
+        self._timer.stop()
+        self.refresh()
+        if self.telemetry is not None:
+            self.retry_btn.setEnabled(bool(self.telemetry.skipped))
+
+    def append(self, text, when=None):
+        stamp = time.strftime("%H:%M:%S", time.localtime(when or time.time()))
+        self.log.appendPlainText(f"{stamp}  {text}")
+
+    def refresh(self):
+        if self.telemetry is None:
+            return
+        events, self._event_index, missed = self.telemetry.events_since(self._event_index)
+        if missed:
+            self.append(f"… {missed} older events dropped before they could be shown")
+        for when, text in events:
+            self.append(text, when)
+
+        snapshot = self.telemetry.snapshot()
+        endpoints = snapshot["endpoints"]
+        self.endpoints.setRowCount(len(endpoints))
+        for row, (endpoint, stats) in enumerate(sorted(endpoints.items())):
+            statuses = ", ".join(f"{status}: {count}" for status, count in sorted(stats["statuses"].items()))
+            values = (
+                endpoint, stats["requests"], statuses, stats["retries"],
+                stats["p50_ms"], stats["p90_ms"], stats["p99_ms"], stats["max_ms"],
+            )
+            for col, value in enumerate(values):
+                item = QTableWidgetItem(str(value))
+                if col != 0:
+                    item.setTextAlignment(Qt.AlignCenter)
+                self.endpoints.setItem(row, col, item)
+
+        lines = []
+        for host, stats in snapshot["hosts"].items():
+            text = host
+            if stats["min_app_headroom"] is not None:
+                text += f": lowest headroom {stats['min_app_headroom']:.0%}"
+            if stats["throttled"]:
+                text += " · 429s " + ", ".join(f"{kind} {count}" for kind, count in stats["throttled"].items())
+            lines.append(text)
+        skips = snapshot["skip_reasons"]
+        if skips:
+            lines.append(
+                f"Skipped {sum(skips.values())}: "
+                + "; ".join(f"{reason} ({count})" for reason, count in sorted(skips.items(), key=lambda i: -i[1]))
+            )
+        lines.append(f"Elapsed {snapshot['seconds']:.1f} s")
+        self.summary.setText("\n".join(lines))
+
+    def export_json(self):
+        if self.telemetry is None:
+            return
+        path, _ = QFileDialog.getSaveFileName(self, "Export Sync Telemetry", "", "JSON Files (*.json)")
+        if not path:
+            return
+        try:
+            self.telemetry.export_json(path)
+            self.append(f"Telemetry exported to {path}")
+        except OSError as e:
+            print(f"[Export Telemetry] Error: {e}")
+            self.append(f"Telemetry export failed: {e}")
@@ -0,0 +1,145 @@
+# app/rate_limit.py
+import threading
+import time
+from collections import deque
+
+# Personal/development key defaults until the first response tells us otherwise
+DEFAULT_APP_LIMITS = "20:1,100:120"
+# Riot's windows start on their side; pad ours slightly so we never overshoot
+WINDOW_MARGIN = 0.05
+DEFAULT_RETRY_AFTER = 1.0
+
+
+def parse_limits(header):
+    """Parse a rate limit header like "20:1,100:120" into [(count, seconds), ...]."""
+    limits = []
+    if not header:
+        return limits
+    for part in header.split(","):
+        try:
+            count, window = part.strip().split(":")
+            limits.append((int(count), int(window)))
+        except ValueError:
+            continue
+    return limits
+
+
+class TokenBucket:
+    """Hands out `limit` tokens; each token returns to the bucket `window` seconds after use."""
+
+    __slots__ = ("limit", "window", "_stamps")
+
+    def __init__(self, limit, window):
+        self.limit = limit
+        self.window = window + WINDOW_MARGIN
+        self._stamps = deque()
+
+    def _expire(self, now):
+        stamps = self._stamps
+        while stamps and stamps[0] <= now - self.window:
+            stamps.popleft()
+
+    def wait_time(self, now):
+        self._expire(now)
+        if len(self._stamps) < self.limit:
+            return 0.0
+        return self._stamps[0] + self.window - now
+
+    def take(self, now):
+        self._stamps.append(now)
+
+    def sync_count(self, count, now):
+        # Another client may share the key; trust the server if it has seen more
+        self._expire(now)
+        missing = count - len(self._stamps)
+        for _ in range(max(0, missing)):
+            self._stamps.append(now)
+
+    def in_use(self, now):
+        self._expire(now)
+        return len(self._stamps)
+
+
+class RateLimiter:
+    """Blocks callers until both the app-wide and the per-method buckets have a token."""
+
+    def __init__(self, app_limits=DEFAULT_APP_LIMITS):
+        self._cond = threading.Condition()
+        self._app_buckets = self._build_buckets(parse_limits(app_limits), [])
+        self._method_buckets = {}
+        self._app_blocked_until = 0.0
+        self._method_blocked_until = {}
+        self._cancelled = False
+
+    @staticmethod
+    def _build_buckets(limits, old_buckets):
+        old = {(b.limit, b.window - WINDOW_MARGIN): b for b in old_buckets}
+        return [old.get((count, window)) or TokenBucket(count, window) for count, window in limits]
+
+    def acquire(self, method):
+        """Wait for a token; returns False instead if the limiter was cancelled."""
+        with self._cond:
+            while True:
+                if self._cancelled:
+                    return False
+                now = time.monotonic()
+                buckets = self._app_buckets + self._method_buckets.get(method, [])
+                wait = max(
+                    self._app_blocked_until - now,
+                    self._method_blocked_until.get(method, 0.0) - now,
+                    max((b.wait_time(now) for b in buckets), default=0.0),
+                )
+                if wait <= 0:
+                    for bucket in buckets:
+                        bucket.take(now)
+                    return True
+                self._cond.wait(wait)
+
+    def cancel(self):
+        """Wake every waiting caller and refuse tokens from now on."""
+        with self._cond:
+            self._cancelled = True
+            self._cond.notify_all()
+
+    def update(self, method, headers):
+        app_limits = parse_limits(headers.get("X-App-Rate-Limit"))
+        method_limits = parse_limits(headers.get("X-Method-Rate-Limit"))
+        app_counts = parse_limits(headers.get("X-App-Rate-Limit-Count"))
+        method_counts = parse_limits(headers.get("X-Method-Rate-Limit-Count"))
+        with self._cond:
+            now = time.monotonic()
+            if app_limits:
+                self._app_buckets = self._build_buckets(app_limits, self._app_buckets)
+            if method_limits:
+                self._method_buckets[method] = self._build_buckets(
+                    method_limits, self._method_buckets.get(method, [])
+                )
+            self._sync_counts(self._app_buckets, app_counts, now)
+            self._sync_counts(self._method_buckets.get(method, []), method_counts, now)
+            self._cond.notify_all()
+
+    @staticmethod
+    def _sync_counts(buckets, counts, now):
+        by_window = {window: count for count, window in counts}
+        for bucket in buckets:
+            count = by_window.get(round(bucket.window - WINDOW_MARGIN))
+            if count is not None:
+                bucket.sync_count(count, now)
+
+    def throttled(self, method, headers):
+        """Record a 429 and return how long the caller should back off."""
+        try:
+            delay = float(headers.get("Retry-After", DEFAULT_RETRY_AFTER))
+        except ValueError:
+            delay = DEFAULT_RETRY_AFTER
+        limit_type = headers.get("X-Rate-Limit-Type", "")
+        with self._cond:
+            until = time.monotonic() + delay
+            if limit_type == "application":
+                self._app_blocked_until = max(self._app_blocked_until, until)
+            elif limit_type == "method":
+                self._method_blocked_until[method] = max(
+                    self._method_blocked_until.get(method, 0.0), until
+                )
+            self._cond.notify_all()
+        return delay
@@ -1,73 +1,416 @@
 # app/riot_api.py
+import os
+import queue
 import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
 import requests
 from PySide6.QtCore import QThread, Signal
 
-class RiotUpdateThread(QThread):
-    finished = Signal(list)
+from app.database import SYNC_STALE_AFTER, riot_id_key
+from app.rate_limit import RateLimiter
+from app.telemetry import SyncTelemetry
 
-    def __init__(self, db_path, api_key):
-        super().__init__()
-        self.db_path = db_path
-        self.api_key = api_key
+# {host} is a platform (euw1) or regional (europe) routing value
+API_URL = "https://{host}.api.riotgames.com"
+# Point the sync elsewhere, e.g. at the local mock: LOLAM_RIOT_API_URL=http://127.0.0.1:8010/{host}
+RIOT_API_URL_ENV = "LOLAM_RIOT_API_URL"
+# Platform that serves summoner-v4/league-v4 for each account region
+PLATFORMS = {"EUNE": "eun1", "EUW": "euw1", "TR": "tr1", "PBE": "pbe1"}
+# Regional route that serves account-v1 for each platform
+REGIONAL_ROUTES = {"eun1": "europe", "euw1": "europe", "tr1": "europe", "pbe1": "americas"}
+# Each routing value has its own rate budget, so each gets its own workers
+WORKERS_PER_HOST = 8
+# Sync results are written to the database every this many accounts, or this often
+SYNC_BATCH_SIZE = 50
+SYNC_BATCH_SECONDS = 2.0
+# No ranked queue below this summoner level, so league-v4 isn't asked
+MIN_RANKED_LEVEL = 30
+MAX_RETRIES = 3
+REQUEST_TIMEOUT = 10
+# Tier code used in the ranked string; Grandmaster would otherwise read as Gold ("GI/...")
+APEX_TIERS = {"MASTER": "M", "GRANDMASTER": "GM", "CHALLENGER": "C"}
+
+
+def api_base_url():
+    return os.environ.get(RIOT_API_URL_ENV) or API_URL
 
-    def run(self):
-        updates = []
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
-        cursor.execute("SELECT id, riot_id FROM accounts WHERE riot_id != ''")
-        rows = cursor.fetchall()
 
-        headers = {"X-Riot-Token": self.api_key}
+def format_ranked(tier, rank, lp):
+    """"GOLD", "II", 45 -> "GII/45LP"; apex tiers have no division: "GRANDMASTER" -> "GM 320LP"."""
+    if tier in APEX_TIERS:
+        return f"{APEX_TIERS[tier]} {lp}LP"
+    return f"{tier[0]}{rank}/{lp}LP"
 
-        for row in rows:
-            acc_id = row["id"]
-            riot_id = row["riot_id"]
+
+class RiotClient:
+    def __init__(self, api_key, base_url=None, telemetry=None):
+        self.base_url = (base_url or api_base_url()).rstrip("/")
+        self.telemetry = telemetry or SyncTelemetry()
+        self.headers = {"X-Riot-Token": api_key}
+        # Riot counts rate limits per routing value, so every host gets its own limiter
+        self.limiters = {}
+        self._limiters_lock = threading.Lock()
+        self._local = threading.local()
+        self.cancelled = threading.Event()
+
+    def url(self, host, path):
+        return self.base_url.replace("{host}", host) + path
+
+    def limiter(self, host):
+        with self._limiters_lock:
+            limiter = self.limiters.get(host)
+            if limiter is None:
+                limiter = self.limiters[host] = RateLimiter()
+                if self.cancelled.is_set():
+                    limiter.cancel()
+            return limiter
+
+    def cancel(self):
+        """Make every pending and future get() return None without waiting out its backoff."""
+        with self._limiters_lock:
+            self.cancelled.set()
+            for limiter in self.limiters.values():
+                limiter.cancel()
+
+    def _session(self):
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = requests.Session()
+            session.headers.update(self.headers)
+            self._local.session = session
+        return session
+
+    def get(self, host, method, path):
+        limiter = self.limiter(host)
+        url = self.url(host, path)
+        resp = None
+        for attempt in range(MAX_RETRIES + 1):
+            if not limiter.acquire(method):
+                return None
+            started = time.perf_counter()
             try:
-                game_name, tag = riot_id.split("#")
-            except ValueError:
+                resp = self._session().get(url, timeout=REQUEST_TIMEOUT)
+            except requests.RequestException as e:
+                self.telemetry.record_request(host, method, type(e).__name__, time.perf_counter() - started, attempt)
+                self.cancelled.wait(2 ** attempt)
                 continue
-
-            puuid_resp = requests.get(
-                f"https://europe.api.riotgames.com/riot/account/v1/accounts/by-riot-id/{game_name}/{tag}",
-                headers=headers,
+            self.telemetry.record_request(
+                host, method, resp.status_code, time.perf_counter() - started, attempt, resp.headers
             )
-            if puuid_resp.status_code != 200:
+            limiter.update(method, resp.headers)
+            if resp.status_code == 429:
+                delay = limiter.throttled(method, resp.headers)
+                # Service-level throttling isn't tracked by the limiter, wait here instead
+                if resp.headers.get("X-Rate-Limit-Type") not in ("application", "method"):
+                    self.cancelled.wait(delay)
                 continue
-            puuid = puuid_resp.json().get("puuid")
-
-            summoner_resp = requests.get(
-                f"https://europe.api.riotgames.com/lol/summoner/v4/summoners/by-puuid/{puuid}",
-                headers=headers,
-            )
-            if summoner_resp.status_code != 200:
+            if resp.status_code >= 500:
+                self.cancelled.wait(2 ** attempt)
                 continue
-            summoner_data = summoner_resp.json()
-            summoner_id = summoner_data.get("id")
-            lvl = summoner_data.get("summonerLevel", 0)
+            return resp
+        return resp
+
+
+def sync_fields(update):
+    """The account fields a sync update sets; ranked data is absent below level 30."""
+    _, lvl, wins, losses, ranked = update
+    fields = {}
+    if wins is not None:
+        wr = round(wins / (wins + losses) * 100, 1) if (wins + losses) else 0.0
+        fields = {"wins": wins, "losses": losses, "ranked": ranked, "winrate": wr}
+    if lvl is not None:
+        fields["level"] = lvl
+    return fields
+
+
+def parse_league(entries):
+    """(wins, losses, ranked string) of the solo/duo entry; unranked is (0, 0, "")."""
+    for entry in entries:
+        if entry.get("queueType") != "RANKED_SOLO_5x5":
+            continue
+        tier = entry.get("tier", "")
+        rank = entry.get("rank", "")
+        ranked = format_ranked(tier, rank, entry.get("leaguePoints", 0)) if tier and rank is not None else ""
+        return entry.get("wins", 0), entry.get("losses", 0), ranked
+    return 0, 0, ""
+
+
+class SyncJob:
+    """One account on its way through the pipeline."""
+
+    __slots__ = ("row", "platform", "puuid", "cached", "level")
+
+    def __init__(self, row, platform, puuid):
+        self.row = row
+        self.platform = platform
+        self.puuid = puuid
+        self.cached = puuid is not None
+        self.level = None
+
+
+class SyncPipeline:
+    """Takes each account through only the requests it needs, one worker pool per routing value.
+
+    account-v1 (Riot ID -> PUUID, skipped when cached) runs on the regional host;
+    summoner-v4 (level, only when asked for or below level 30) and league-v4 by PUUID
+    on the platform. Accounts move to the next host's queue as soon as a stage is done,
+    so one account's league call overlaps another's Riot ID lookup. Every account ends
+    up in `results` as (row, update or None, newly resolved PUUID or None).
+    """
+
+    def __init__(self, client, fetch_levels=False):
+        self.client = client
+        self.fetch_levels = fetch_levels
+        self.results = queue.Queue()
+        self._pools = {}
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def start(self, row, platform, cached_puuid=None):
+        job = SyncJob(row, platform, cached_puuid)
+        if cached_puuid is None:
+            self._submit(REGIONAL_ROUTES[platform], self.resolve, job)
+        else:
+            self._after_puuid(job)
 
-            league_resp = requests.get(
-                f"https://europe.api.riotgames.com/lol/league/v4/entries/by-summoner/{summoner_id}",
-                headers=headers,
+    def shutdown(self):
+        """Drop queued stages and wait for the running ones."""
+        with self._lock:
+            self._closed = True
+            pools = list(self._pools.values())
+        for pool in pools:
+            pool.shutdown(cancel_futures=True)
+
+    def _submit(self, host, stage, job):
+        with self._lock:
+            if self._closed:
+                return
+            pool = self._pools.get(host)
+            if pool is None:
+                pool = self._pools[host] = ThreadPoolExecutor(WORKERS_PER_HOST, thread_name_prefix=f"riot-{host}")
+            pool.submit(self._run, stage, job)
+
+    def _run(self, stage, job):
+        try:
+            stage(job)
+        except Exception as e:
+            print(f"[Riot Sync] Error: {e}")
+            self._fail(job, f"error: {e}")
+
+    def _fail(self, job, reason):
+        # Accounts dropped by a cancel aren't failures
+        if not self.client.cancelled.is_set():
+            self.client.telemetry.skip(job.row["id"], job.row["riot_id"], reason)
+        self._finish(job, None)
+
+    @staticmethod
+    def _failure(endpoint, resp):
+        if resp is None:
+            return f"{endpoint}: no response after {MAX_RETRIES} retries"
+        return f"{endpoint}: HTTP {resp.status_code}"
+
+    def _finish(self, job, update):
+        puuid = job.puuid if update is not None and not job.cached else None
+        self.results.put((job.row, update, puuid))
+
+    def _after_puuid(self, job):
+        if self.fetch_levels or (job.row["level"] or 0) < MIN_RANKED_LEVEL:
+            self._submit(job.platform, self.summoner, job)
+        else:
+            self._submit(job.platform, self.league, job)
+
+    def _stale(self, job, resp):
+        # A cached PUUID the platform doesn't know (Riot ID reassigned, account moved): look it up again
+        if job.cached and resp is not None and resp.status_code in (400, 404):
+            job.cached, job.puuid = False, None
+            self._submit(REGIONAL_ROUTES[job.platform], self.resolve, job)
+            return True
+        return False
+
+    def resolve(self, job):
+        try:
+            game_name, tag = job.row["riot_id"].split("#")
+        except ValueError:
+            return self._fail(job, "Riot ID is not in Name#Tag form")
+        resp = self.client.get(
+            REGIONAL_ROUTES[job.platform],
+            "account-v1.by-riot-id",
+            f"/riot/account/v1/accounts/by-riot-id/{game_name}/{tag}",
+        )
+        if resp is not None and resp.status_code == 404:
+            return self._fail(job, "Riot ID not found")
+        if resp is None or resp.status_code != 200:
+            return self._fail(job, self._failure("account-v1.by-riot-id", resp))
+        job.puuid = resp.json().get("puuid")
+        self._after_puuid(job)
+
+    def summoner(self, job):
+        resp = self.client.get(
+            job.platform,
+            "summoner-v4.by-puuid",
+            f"/lol/summoner/v4/summoners/by-puuid/{job.puuid}",
+        )
+        if self._stale(job, resp):
+            return
+        if resp is None or resp.status_code != 200:
+            return self._fail(job, self._failure("summoner-v4.by-puuid", resp))
+        job.level = resp.json().get("summonerLevel", 0)
+        if job.level < MIN_RANKED_LEVEL:
+            return self._finish(job, (job.row["id"], job.level, None, None, None))
+        # Same host, so carry on here rather than queueing behind other accounts
+        self.league(job)
+
+    def league(self, job):
+        resp = self.client.get(
+            job.platform,
+            "league-v4.by-puuid",
+            f"/lol/league/v4/entries/by-puuid/{job.puuid}",
+        )
+        if self._stale(job, resp):
+            return
+        if resp is None or resp.status_code != 200:
+            return self._fail(job, self._failure("league-v4.by-puuid", resp))
+        wins, losses, ranked = parse_league(resp.json())
+        self._finish(job, (job.row["id"], job.level, wins, losses, ranked))
+
+
+class SyncBatch:
+    """Sync results not yet written to the database."""
+
+    def __init__(self):
+        self.changes = []
+        self.synced = []
+        self.changed = []
+        self.resolved = {}
+        self.started = time.monotonic()
+
+    def add(self, row, update, puuid, changed):
+        self.synced.append(row["id"])
+        if changed:
+            self.changed.append(row["id"])
+            self.changes.append((row["id"], sync_fields(update)))
+        if puuid:
+            self.resolved[row["riot_id"]] = puuid
+
+    def due(self):
+        return len(self.synced) >= SYNC_BATCH_SIZE or time.monotonic() - self.started >= SYNC_BATCH_SECONDS
+
+    def save(self, db, run_id):
+        if self.synced or self.resolved:
+            db.save_sync_batch(run_id, self.changes, self.synced, self.changed, self.resolved)
+        self.__init__()
+
+
+class RiotUpdateThread(QThread):
+    account_synced = Signal(object)
+    progress = Signal(int, int)
+    finished = Signal(list)
+
+    def __init__(self, db, api_key, base_url=None, stale_after=SYNC_STALE_AFTER, force=False, resume_run=None,
+                 fetch_levels=False):
+        super().__init__()
+        self.db = db
+        self.telemetry = SyncTelemetry()
+        self.client = RiotClient(api_key, base_url, self.telemetry)
+        # Levels cost a summoner-v4 call per account, so they're only fetched when asked
+        # for (and for accounts below level 30, to see whether ranked has unlocked)
+        self.fetch_levels = fetch_levels
+        # force re-fetches accounts synced within the last stale_after seconds too
+        self.stale_after = 0 if force else stale_after
+        # A sync_runs row to continue instead of starting a new run
+        self.resume_run = resume_run
+        self.skipped_fresh = 0
+        self.status = "running"
+        self._resume_later = False
+
+    def cancel(self, resume_later=False):
+        """Stop after the requests in flight; with resume_later the run continues on the next launch."""
+        self._resume_later = resume_later
+        self.client.cancel()
+
+    def run(self):
+        db = self.db
+        client = self.client
+        pipeline = None
+        run_id = None
+        updates = []
+        batch = SyncBatch()
+        done = total = 0
+        try:
+            if self.resume_run is not None:
+                run_id, synced_before = self.resume_run["id"], self.resume_run["synced_before"]
+                db.resume_sync_run(run_id)
+            else:
+                synced_before = time.time() - self.stale_after
+            rows = db.fetch_riot_targets(synced_before)
+            if run_id is None:
+                run_id = db.start_sync_run(synced_before, len(rows))
+            self.skipped_fresh = db.count_fresh_riot_targets(synced_before)
+            cache = db.fetch_riot_id_cache()
+            self.telemetry.log(
+                f"Sync {'resumed' if self.resume_run is not None else 'started'}: {len(rows)} accounts due, "
+                f"{self.skipped_fresh} synced recently"
             )
-            if league_resp.status_code != 200:
-                continue
-            queue_data = [
-                entry for entry in league_resp.json() if entry.get("queueType") == "RANKED_SOLO_5x5"
-            ]
-            wins, losses, ranked_str = 0, 0, ""
-            if queue_data:
-                entry = queue_data[0]
-                wins = entry.get("wins", 0)
-                losses = entry.get("losses", 0)
-                tier = entry.get("tier", "")
-                rank = entry.get("rank", "")
-                lp = entry.get("leaguePoints", 0)
-                if tier and rank is not None:
-                    ranked_str = f"{tier[0]}{rank}/{lp}LP"
-
-            updates.append((acc_id, lvl, wins, losses, ranked_str))
-
-        conn.close()
-        self.finished.emit(updates)
\ No newline at end of file
+
+            pipeline = SyncPipeline(client, self.fetch_levels)
+            # Most urgent first; every host's queue keeps this order
+            for row in rows:
+                platform = PLATFORMS.get(row["region"])
+                if platform is None:
+                    self.telemetry.skip(row["id"], row["riot_id"], f"no platform for region {row['region']!r}")
+                    continue
+                pipeline.start(row, platform, cache.get(riot_id_key(row["riot_id"])))
+                total += 1
+
+            self.progress.emit(0, total)
+            while done < total and not client.cancelled.is_set():
+                try:
+                    row, update, puuid = pipeline.results.get(timeout=SYNC_BATCH_SECONDS)
+                except queue.Empty:
+                    if batch.due():
+                        batch.save(db, run_id)
+                    continue
+                done += 1
+                if update:
+                    changed = self.has_changed(row, update)
+                    batch.add(row, update, puuid, changed)
+                    if changed:
+                        updates.append(update)
+                        self.account_synced.emit(update)
+                if batch.due():
+                    batch.save(db, run_id)
+                self.progress.emit(done, total)
+        except sqlite3.Error as e:
+            # e.g. the database stayed locked past the busy timeout
+            self.status = "failed"
+            self.telemetry.log(f"Sync failed: {e}")
+        finally:
+            if pipeline is not None:
+                pipeline.shutdown()
+            if self.status != "failed":
+                if client.cancelled.is_set():
+                    self.status = "interrupted" if self._resume_later else "cancelled"
+                else:
+                    self.status = "done"
+            if run_id is not None:
+                try:
+                    batch.save(db, run_id)
+                    # A failed run is picked up again on the next launch
+                    db.finish_sync_run(run_id, "interrupted" if self.status == "failed" else self.status)
+                except sqlite3.Error as e:
+                    self.status = "failed"
+                    self.telemetry.log(f"Could not save sync results: {e}")
+            db.close_thread_connection()
+            self.telemetry.log(f"Sync {self.status}: {done}/{total} accounts, {len(updates)} updated")
+            self.telemetry.finish()
+            self.finished.emit(updates)
+
+    @staticmethod
+    def has_changed(row, update):
+        _, lvl, wins, losses, ranked = update
+        if lvl is not None and lvl != row["level"]:
+            return True
+        return wins is not None and (wins, losses, ranked) != (row["wins"], row["losses"], row["ranked"])
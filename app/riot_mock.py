@@ -0,0 +1,287 @@
+# app/riot_mock.py
+"""Local stand-in for the Riot endpoints the sync uses (account-v1, summoner-v4, league-v4).
+
+Serves deterministic fixture data and can add latency, enforce rate limits with Riot's
+headers, and inject 429/5xx responses, so sync throughput and backoff can be tried offline:
+
+    python -m app.riot_mock --port 8010 --latency 0.05 --app-limit 20:1,100:120
+    LOLAM_RIOT_API_URL=http://127.0.0.1:8010/{host} python main.py
+
+The routing value (euw1, europe, ...) goes in front of the path, and like on Riot's
+side every routing value has its own rate limits.
+"""
+import argparse
+import json
+import random
+import re
+import threading
+import time
+import zlib
+from collections import Counter, deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from app.rate_limit import parse_limits
+
+# Effectively unlimited unless a limit is asked for
+UNLIMITED = "100000:1"
+TIERS = ("IRON", "BRONZE", "SILVER", "GOLD", "PLATINUM", "EMERALD", "DIAMOND")
+APEX_TIERS = ("MASTER", "GRANDMASTER", "CHALLENGER")
+DIVISIONS = ("IV", "III", "II", "I")
+# Routing value for requests without one in front of the path
+DEFAULT_HOST = "default"
+# Game names the synthetic databases use; with `accounts` set only the first N exist
+PLAYER_NAME = re.compile(r"Player(\d+)$")
+
+
+def _seed(text):
+    return zlib.crc32(text.encode("utf-8"))
+
+
+def account_fixture(game_name, tag):
+    return {"puuid": f"puuid-{game_name}-{tag}", "gameName": game_name, "tagLine": tag}
+
+
+def summoner_fixture(puuid):
+    return {"id": f"summoner-{puuid}", "puuid": puuid, "summonerLevel": 1 + _seed(puuid) % 500}
+
+
+def league_fixture(summoner_id):
+    seed = _seed(summoner_id)
+    if seed % 10 < 3:
+        return []
+    apex = seed % 50 == 0
+    return [{
+        "queueType": "RANKED_SOLO_5x5",
+        "tier": APEX_TIERS[seed // 50 % len(APEX_TIERS)] if apex else TIERS[seed % len(TIERS)],
+        "rank": "I" if apex else DIVISIONS[seed // 7 % len(DIVISIONS)],
+        "leaguePoints": seed % 1500 if apex else seed % 100,
+        "wins": seed % 300,
+        "losses": seed // 300 % 300,
+    }]
+
+
+class SlidingLimits:
+    """Request timestamps per (count, window) limit, reported the way Riot's headers are."""
+
+    def __init__(self, limits):
+        self.limits = parse_limits(limits)
+        self.header = limits
+        self._stamps = [deque() for _ in self.limits]
+
+    def hit(self, now):
+        """Count a request; returns seconds until it would have been allowed, or 0."""
+        retry_after = 0.0
+        for (count, window), stamps in zip(self.limits, self._stamps):
+            while stamps and stamps[0] <= now - window:
+                stamps.popleft()
+            if len(stamps) >= count:
+                retry_after = max(retry_after, stamps[0] + window - now)
+        if not retry_after:
+            for stamps in self._stamps:
+                stamps.append(now)
+        return retry_after
+
+    def counts(self):
+        return ",".join(f"{len(stamps)}:{window}" for (_, window), stamps in zip(self.limits, self._stamps))
+
+
+class MockConfig:
+    def __init__(self, latency=0.0, jitter=0.0, app_limit=UNLIMITED, method_limit=UNLIMITED,
+                 error_rate=0.0, throttle_rate=0.0, accounts=None, seed=0):
+        self.latency = latency
+        self.jitter = jitter
+        self.app_limit = app_limit
+        self.method_limit = method_limit
+        # Share of requests answered 503, and 429s without X-Rate-Limit-Type (service throttling)
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.accounts = accounts
+        self.seed = seed
+
+
+class MockState:
+    def __init__(self, config):
+        self.config = config
+        self.lock = threading.Lock()
+        self.random = random.Random(config.seed)
+        # Keyed by routing value, and (routing value, method)
+        self.app_limits = {}
+        self.method_limits = {}
+        # "routing value method status" -> requests answered
+        self.stats = Counter()
+
+    def admit(self, host, method):
+        """Returns (status, extra headers, delay) for a request that passed routing."""
+        config = self.config
+        with self.lock:
+            now = time.monotonic()
+            app_limits = self.app_limits.get(host)
+            if app_limits is None:
+                app_limits = self.app_limits[host] = SlidingLimits(config.app_limit)
+            limits = self.method_limits.get((host, method))
+            if limits is None:
+                limits = self.method_limits[(host, method)] = SlidingLimits(config.method_limit)
+            headers = {
+                "X-App-Rate-Limit": app_limits.header,
+                "X-Method-Rate-Limit": limits.header,
+            }
+            status = 200
+            app_wait = app_limits.hit(now)
+            method_wait = 0.0 if app_wait else limits.hit(now)
+            if app_wait or method_wait:
+                status = 429
+                headers["Retry-After"] = str(max(1, round(app_wait or method_wait)))
+                headers["X-Rate-Limit-Type"] = "application" if app_wait else "method"
+            else:
+                roll = self.random.random()
+                if roll < config.throttle_rate:
+                    status = 429
+                    headers["Retry-After"] = "1"
+                elif roll < config.throttle_rate + config.error_rate:
+                    status = 503
+            headers["X-App-Rate-Limit-Count"] = app_limits.counts()
+            headers["X-Method-Rate-Limit-Count"] = limits.counts()
+            delay = config.latency + self.random.uniform(0, config.jitter) if status != 429 else 0.0
+        return status, headers, delay
+
+    def record(self, host, method, status):
+        with self.lock:
+            self.stats[f"{host} {method} {status}"] += 1
+
+
+class MockHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out in separate writes; don't let Nagle hold the body back
+    disable_nagle_algorithm = True
+
+    routes = (
+        ("account-v1.by-riot-id", "/riot/account/v1/accounts/by-riot-id/"),
+        ("summoner-v4.by-puuid", "/lol/summoner/v4/summoners/by-puuid/"),
+        ("league-v4.by-summoner", "/lol/league/v4/entries/by-summoner/"),
+        ("league-v4.by-puuid", "/lol/league/v4/entries/by-puuid/"),
+    )
+
+    def do_GET(self):
+        state = self.server.state
+        host, path = DEFAULT_HOST, self.path
+        if not path.startswith(("/riot/", "/lol/")):
+            host, _, rest = path[1:].partition("/")
+            path = "/" + rest
+        for method, prefix in self.routes:
+            if path.startswith(prefix):
+                break
+        else:
+            self._reply(host, "unknown", 404, {"status": {"status_code": 404, "message": "Not found"}}, {})
+            return
+
+        status, headers, delay = state.admit(host, method)
+        if delay:
+            time.sleep(delay)
+        if status != 200:
+            self._reply(host, method, status, {"status": {"status_code": status}}, headers)
+            return
+        body = self.fixture(method, path[len(prefix):])
+        if body is None:
+            self._reply(host, method, 404, {"status": {"status_code": 404, "message": "Data not found"}}, headers)
+        else:
+            self._reply(host, method, 200, body, headers)
+
+    def fixture(self, method, rest):
+        if method == "account-v1.by-riot-id":
+            game_name, _, tag = rest.partition("/")
+            if not tag or not self.known(game_name):
+                return None
+            return account_fixture(game_name, tag)
+        # Only ids this mock handed out exist
+        if method == "league-v4.by-summoner":
+            return league_fixture(rest) if rest.startswith("summoner-puuid-") else None
+        if not rest.startswith("puuid-"):
+            return None
+        if method == "summoner-v4.by-puuid":
+            return summoner_fixture(rest)
+        return league_fixture(summoner_fixture(rest)["id"])
+
+    def known(self, game_name):
+        accounts = self.server.state.config.accounts
+        if accounts is None:
+            return True
+        match = PLAYER_NAME.match(game_name)
+        return match is not None and int(match.group(1)) < accounts
+
+    def _reply(self, host, method, status, payload, headers):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json;charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+        self.server.state.record(host, method, status)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class RiotMock:
+    """Runs the mock on a background thread, for the duration of a `with` block or until stop()."""
+
+    def __init__(self, config=None, host="127.0.0.1", port=0):
+        self.server = ThreadingHTTPServer((host, port), MockHandler)
+        self.server.daemon_threads = True
+        self.server.state = MockState(config or MockConfig())
+        self.base_url = f"http://{host}:{self.server.server_port}/{{host}}"
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def stats(self):
+        return dict(self.server.state.stats)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve a local mock of the Riot API.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8010)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every response")
+    parser.add_argument("--jitter", type=float, default=0.0, help="up to this many extra seconds, at random")
+    parser.add_argument("--app-limit", default=UNLIMITED, help='like Riot\'s header, e.g. "20:1,100:120"')
+    parser.add_argument("--method-limit", default=UNLIMITED)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of requests answered 503")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="share answered with a service 429")
+    parser.add_argument("--accounts", type=int, help="only Player0..PlayerN-1 resolve")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    config = MockConfig(
+        latency=args.latency, jitter=args.jitter, app_limit=args.app_limit, method_limit=args.method_limit,
+        error_rate=args.error_rate, throttle_rate=args.throttle_rate, accounts=args.accounts, seed=args.seed,
+    )
+    mock = RiotMock(config, args.host, args.port)
+    print(f"Riot mock listening on {mock.base_url}")
+    try:
+        mock.server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        mock.server.server_close()
+        for key, count in sorted(mock.stats.items()):
+            print(f"{key}: {count}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,30 @@
+# app/startup.py
+import os
+import sys
+import time
+
+# Set LOLAM_STARTUP_TIMING=1 or pass --startup-timing to print startup milestones
+STARTUP_TIMING_ENV = "LOLAM_STARTUP_TIMING"
+STARTUP_TIMING_FLAG = "--startup-timing"
+
+
+class StartupTimer:
+    """Prints how long after process start each startup milestone was reached, once per label."""
+
+    def __init__(self, enabled=None):
+        self.started = time.perf_counter()
+        if enabled is None:
+            enabled = bool(os.environ.get(STARTUP_TIMING_ENV)) or STARTUP_TIMING_FLAG in sys.argv
+        self.enabled = enabled
+        self.marks = {}
+
+    def mark(self, label):
+        if label in self.marks:
+            return
+        elapsed = (time.perf_counter() - self.started) * 1000
+        self.marks[label] = elapsed
+        if self.enabled:
+            print(f"[Startup] {label}: {elapsed:.0f} ms")
+
+
+timer = StartupTimer()
@@ -0,0 +1,138 @@
+# app/telemetry.py
+import json
+import threading
+import time
+from itertools import islice
+from collections import Counter, defaultdict, deque
+
+from app.rate_limit import parse_limits
+
+PERCENTILES = (50, 90, 99)
+# Events kept for the log panel; older ones only survive in the counters
+MAX_EVENTS = 5000
+
+
+def percentile(ordered, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not ordered:
+        return None
+    rank = max(1, -(-pct * len(ordered) // 100))
+    return ordered[rank - 1]
+
+
+def headroom(limits_header, counts_header):
+    """Share of the tightest rate limit window still unused, from Riot's limit/count headers."""
+    counts = {window: count for count, window in parse_limits(counts_header)}
+    shares = [
+        1 - counts.get(window, 0) / limit
+        for limit, window in parse_limits(limits_header)
+        if limit
+    ]
+    return min(shares) if shares else None
+
+
+class SyncTelemetry:
+    """Request and skip statistics for one Riot sync, recorded from any worker thread."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.started = time.time()
+        self.finished = None
+        # endpoint (rate limit method name) -> latencies in seconds / status -> count
+        self.latencies = defaultdict(list)
+        self.statuses = defaultdict(Counter)
+        self.retries = Counter()
+        # host -> lowest app headroom seen; (host, endpoint) -> lowest method headroom
+        self.app_headroom = {}
+        self.method_headroom = {}
+        # host -> X-Rate-Limit-Type of its 429s ("service" when the header is missing)
+        self.throttled = defaultdict(Counter)
+        self.skip_reasons = Counter()
+        self.skipped = []
+        # (time, text) for the log panel; event_count is every event ever logged, so views
+        # can track their position by sequence number while old events fall off the deque
+        self.events = deque(maxlen=MAX_EVENTS)
+        self.event_count = 0
+
+    def record_request(self, host, endpoint, status, seconds, attempt, headers=None):
+        """`status` is the HTTP status, or an exception name when no response came back."""
+        with self._lock:
+            self.latencies[endpoint].append(seconds)
+            self.statuses[endpoint][status] += 1
+            if attempt:
+                self.retries[endpoint] += 1
+            if headers is None:
+                return
+            app = headroom(headers.get("X-App-Rate-Limit"), headers.get("X-App-Rate-Limit-Count"))
+            if app is not None:
+                self.app_headroom[host] = min(app, self.app_headroom.get(host, 1.0))
+            method = headroom(headers.get("X-Method-Rate-Limit"), headers.get("X-Method-Rate-Limit-Count"))
+            if method is not None:
+                key = (host, endpoint)
+                self.method_headroom[key] = min(method, self.method_headroom.get(key, 1.0))
+            if status == 429:
+                limit_type = headers.get("X-Rate-Limit-Type") or "service"
+                self.throttled[host][limit_type] += 1
+                self._event(f"429 from {host} {endpoint} ({limit_type}), retry after {headers.get('Retry-After', '?')}s")
+
+    def skip(self, account_id, riot_id, reason):
+        with self._lock:
+            self.skip_reasons[reason] += 1
+            self.skipped.append({"id": account_id, "riot_id": riot_id, "reason": reason})
+            self._event(f"Skipped {riot_id or account_id}: {reason}")
+
+    def log(self, text):
+        with self._lock:
+            self._event(text)
+
+    def finish(self):
+        with self._lock:
+            self.finished = time.time()
+
+    def _event(self, text):
+        self.events.append((time.time(), text))
+        self.event_count += 1
+
+    def events_since(self, seen):
+        """(events after the first `seen` ever logged, new `seen`, events dropped unseen)
+        for incremental log views."""
+        with self._lock:
+            dropped = self.event_count - len(self.events)
+            missed = max(dropped - seen, 0)
+            return list(islice(self.events, max(seen - dropped, 0), None)), self.event_count, missed
+
+    def snapshot(self):
+        with self._lock:
+            endpoints = {}
+            for endpoint, latencies in self.latencies.items():
+                ordered = sorted(latencies)
+                endpoints[endpoint] = {
+                    "requests": len(ordered),
+                    "statuses": {str(status): count for status, count in self.statuses[endpoint].items()},
+                    "retries": self.retries[endpoint],
+                    **{f"p{pct}_ms": round(percentile(ordered, pct) * 1000, 1) for pct in PERCENTILES},
+                    "max_ms": round(ordered[-1] * 1000, 1),
+                }
+            hosts = {
+                host: {
+                    "min_app_headroom": self.app_headroom.get(host),
+                    "min_method_headroom": {
+                        endpoint: value for (h, endpoint), value in self.method_headroom.items() if h == host
+                    },
+                    "throttled": dict(self.throttled.get(host, {})),
+                }
+                for host in sorted(set(self.app_headroom) | set(self.throttled))
+            }
+            return {
+                "started": self.started,
+                "finished": self.finished,
+                "seconds": round((self.finished or time.time()) - self.started, 3),
+                "endpoints": endpoints,
+                "hosts": hosts,
+                "skip_reasons": dict(self.skip_reasons),
+                "skipped": list(self.skipped),
+            }
+
+    def export_json(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.snapshot(), f, indent=4, ensure_ascii=False)
@@ -2,30 +2,79 @@
 
 from PySide6.QtWidgets import (
     QMainWindow, QToolBar, QHeaderView, QFileDialog, QMessageBox, QDialog,
-    QDialogButtonBox, QToolButton, QMenu, QWidget, QSizePolicy
+    QDialogButtonBox, QToolButton, QMenu, QWidget, QSizePolicy, QLineEdit
 )
-from PySide6.QtGui import QIcon, QStandardItemModel, QStandardItem
-from PySide6.QtCore import Qt
-import os, csv, json
-from datetime import datetime
-
-from app.account_model import AccountTreeView, PasswordDelegate, RankOnlyIconDelegate
-from app.database import DatabaseManager, DB_PATH, Account
-from app.dialogs import AccountDialog, BulkImportPreviewDialog
+from PySide6.QtGui import QIcon, QKeySequence, QShortcut
+from PySide6.QtCore import Qt, QEvent, QTimer
+import os, sqlite3
+
+# Dialogs, importers, backups and the Riot client (requests) are imported on first use
+# so the window can paint before they load
+from app.account_model import (
+    DEFAULT_SORT_COLUMN, SORT_FIELDS, AccountTreeModel, AccountTreeView, MaskingDelegate,
+    PasswordDelegate, RankOnlyIconDelegate
+)
+from app.database import DatabaseManager, DB_PATH
 from app.load import LoadThread
-from app.riot_api import RiotUpdateThread
+from app.log_panel import LogPanel
+from app.startup import timer as startup_timer
+from app.writer import WriteBehindQueue
 
-DB_PATH = os.path.join(os.path.dirname(__file__), "accounts.db")
+# Typing pauses this long before the search runs
+SEARCH_DEBOUNCE_MS = 150
+# Synced accounts the tree has not paged in yet are looked up and merged this often
+SYNC_MERGE_MS = 300
+# Rows measured when fitting column widths to their contents
+FIT_COLUMNS_ROWS = 200
 
 class MainWindow(QMainWindow):
-    def __init__(self):
+    def __init__(self, db_path=DB_PATH):
         super().__init__()
         self.setWindowIcon(QIcon("assets/icons/ico/DataShieldP.ico"))
-        self.db = DatabaseManager(DB_PATH)
-        self.ranked_info = {}
+        # Opened in start(), once the window frame is on screen
+        self.db_path = db_path
+        self.db = None
+        self.writer = None
+        self.model = None
+        self._initial_load = True
+        self.sort_column = DEFAULT_SORT_COLUMN
+        self.sort_order = Qt.DescendingOrder
+        # Sync fields of accounts that were not loaded when their result arrived, by id
+        self._unloaded_synced = {}
+        self.sync_merge_timer = QTimer(self)
+        self.sync_merge_timer.setSingleShot(True)
+        self.sync_merge_timer.setInterval(SYNC_MERGE_MS)
+        self.sync_merge_timer.timeout.connect(self.merge_unloaded_synced)
         self._init_ui()
+
+    def start(self):
+        """Open the database and load the account groups; called after the first paint."""
+        self.db = DatabaseManager(self.db_path)
+        if self.db.moved_duplicates:
+            QMessageBox.information(
+                self, "Duplicate Accounts",
+                f"{self.db.moved_duplicates} duplicate accounts (same region and username) were moved "
+                "to the accounts_duplicates table. The newest copy of each was kept."
+            )
+        self.writer = WriteBehindQueue(self.db)
+        self.writer.write_failed.connect(self.on_write_failed)
+        self.writer.start()
+        self.model = AccountTreeModel(
+            parent=self,
+            sort=SORT_FIELDS[self.sort_column],
+            descending=self.sort_order == Qt.DescendingOrder,
+            fetch_page=self.db.fetch_group_page,
+        )
+        self.model.account_edited.connect(self.on_account_edited)
+        self.tree.setModel(self.model)
+        self._setup_header()
         self.load_data_async()
 
+    def event(self, event):
+        if event.type() == QEvent.Paint:
+            startup_timer.mark("first paint")
+        return super().event(event)
+
     def _init_ui(self):
         self.setWindowTitle("LoL Accounts Manager")
         self.setMinimumSize(800, 600)
@@ -86,14 +135,59 @@ class MainWindow(QMainWindow):
         sync_btn.setIcon(QIcon("assets/icons/ico/DataShieldP.ico"))
         sync_btn.setToolButtonStyle(Qt.ToolButtonTextBesideIcon)
         sync_btn.setAutoRaise(True)
-        sync_btn.clicked.connect(self.sync_riot)
+        sync_btn.setPopupMode(QToolButton.MenuButtonPopup)
+        sync_menu = QMenu(sync_btn)
+        sync_menu.addAction("Sync Stale Accounts", self.sync_riot)
+        sync_menu.addAction("Force Sync All", lambda: self.sync_riot(force=True))
+        sync_menu.addSeparator()
+        # Levels take an extra request per account, so they're opt-in
+        self.update_levels_action = sync_menu.addAction("Update Levels")
+        self.update_levels_action.setCheckable(True)
+        sync_btn.setMenu(sync_menu)
+        sync_btn.clicked.connect(lambda: self.sync_riot())
         toolbar.addWidget(sync_btn)
+
+        cancel_sync_btn = QToolButton()
+        cancel_sync_btn.setText("Cancel Sync")
+        cancel_sync_btn.setAutoRaise(True)
+        cancel_sync_btn.clicked.connect(self.cancel_sync)
+        # Only shown while a sync runs
+        self.cancel_sync_action = toolbar.addWidget(cancel_sync_btn)
+        self.cancel_sync_action.setVisible(False)
+
+        self.log_panel = LogPanel(self)
+        self.log_panel.retry_requested.connect(lambda: self.sync_riot())
+        self.addDockWidget(Qt.BottomDockWidgetArea, self.log_panel)
+        self.log_panel.hide()
+        logs_action = self.log_panel.toggleViewAction()
+        logs_action.setText("Logs")
+        toolbar.addAction(logs_action)
         self.actions = {"Sync Riot": sync_btn}
 
         spacer = QWidget()
         spacer.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Preferred)
         toolbar.addWidget(spacer)
 
+        self.search_box = QLineEdit()
+        self.search_box.setPlaceholderText("Search username, email, Riot ID, rank…")
+        self.search_box.setClearButtonEnabled(True)
+        self.search_box.setFixedWidth(260)
+        toolbar.addWidget(self.search_box)
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(SEARCH_DEBOUNCE_MS)
+        self.search_timer.timeout.connect(self.apply_search)
+        self.search_box.textChanged.connect(lambda _text: self.search_timer.start())
+        QShortcut(QKeySequence.Find, self, self.search_box.setFocus)
+
+        refresh_btn = QToolButton()
+        refresh_btn.setText("Refresh")
+        refresh_btn.setToolTip("Reload all accounts from the database (F5)")
+        refresh_btn.setShortcut("F5")
+        refresh_btn.setAutoRaise(True)
+        refresh_btn.clicked.connect(self.load_data_async)
+        toolbar.addWidget(refresh_btn)
+
         reset_btn = QToolButton()
         reset_btn.setText("Reset DB")
         reset_btn.setToolTip("Delete entire database")
@@ -102,16 +196,65 @@ class MainWindow(QMainWindow):
         toolbar.addWidget(reset_btn)
 
         self.tree = AccountTreeView(self)
+        self.tree.setStyleSheet("QTreeView::item { height: 18px; }")
+        self.username_delegate = MaskingDelegate(not self.show_usernames, self.tree)
+        self.password_delegate = PasswordDelegate(self.tree)
+        self.tree.setItemDelegateForColumn(0, self.username_delegate)
+        self.tree.setItemDelegateForColumn(1, self.password_delegate)
+        ranked_icon_path = os.path.abspath("assets/ranks")
+        self.tree.setItemDelegateForColumn(4, RankOnlyIconDelegate(ranked_icon_path, self.tree))
+        self.tree.header().setSortIndicator(self.sort_column, self.sort_order)
+        self.tree.header().sortIndicatorChanged.connect(self.on_sort_changed)
+        self.tree.setSortingEnabled(True)
         self.setCentralWidget(self.tree)
         self.statusBar().showMessage("Ready")
 
+    def _setup_header(self):
+        # Section modes only stick once the header knows its columns, i.e. after the first setModel
+        header = self.tree.header()
+        if header.sectionResizeMode(4) == QHeaderView.Fixed:
+            return
+        header.setDefaultAlignment(Qt.AlignCenter)
+        # ResizeToContents would re-measure every column on each page fetch; fit_columns()
+        # sizes them once per load instead
+        for col in range(header.count()):
+            header.setSectionResizeMode(col, QHeaderView.Interactive)
+        header.setSectionResizeMode(4, QHeaderView.Fixed)
+        header.resizeSection(4, 24)
+        header.setResizeContentsPrecision(FIT_COLUMNS_ROWS)
+
+    def fit_columns(self):
+        for col in range(self.tree.header().count()):
+            if col != 4:
+                self.tree.resizeColumnToContents(col)
+
+    def on_sort_changed(self, column, order):
+        header = self.tree.header()
+        if column not in SORT_FIELDS:
+            # The model ignores columns it can't sort by; put the indicator back
+            header.blockSignals(True)
+            header.setSortIndicator(self.sort_column, self.sort_order)
+            header.blockSignals(False)
+            return
+        self.sort_column = column
+        self.sort_order = order
+
     def add_account(self):
+        from app.dialogs import AccountDialog
+
         dlg = AccountDialog(self)
         if dlg.exec() == QDialog.Accepted:
             acc = dlg.get_account()
             if acc:
-                self.db.add_account(acc)
-                self.load_data_async()
+                try:
+                    acc.id = self.db.add_account(acc)
+                except sqlite3.IntegrityError:
+                    QMessageBox.warning(
+                        self, "Add Account", f"{acc.username} already exists in {acc.region}."
+                    )
+                    return
+                if self.model is not None:
+                    self.model.add_account(acc)
                 self.statusBar().showMessage("Account added", 3000)
 
     def delete_database(self):
@@ -121,348 +264,284 @@ class MainWindow(QMainWindow):
         )
         if resp == QMessageBox.Yes:
             self.db.delete_all()
-            self.load_data_async()
+            if self.model is not None:
+                self.model.clear()
             self.statusBar().showMessage("Database reset", 3000)
 
     def import_csv(self):
+        import csv
+        from itertools import islice
+        from app.dialogs import BulkImportPreviewDialog
+        from app.importer import csv_import_thread, detect_encoding, iter_csv_rows
+
         path, _ = QFileDialog.getOpenFileName(self, "Import CSV", "", "CSV Files (*.csv)")
         if not path:
             return
-        all_rows = []
-        for enc in ("utf-8-sig", "utf-8", "cp1250", "latin-1"):
-            try:
-                with open(path, newline="", encoding=enc) as f:
-                    reader = csv.DictReader(f)
-                    for row in reader:
-                        all_rows.append(row)
-                break
-            except UnicodeDecodeError:
-                continue
-        if not all_rows:
+        try:
+            encoding = detect_encoding(path)
+            preview_rows = list(islice(iter_csv_rows(path, encoding), 10))
+        except (OSError, UnicodeDecodeError, csv.Error) as e:
+            print(f"[Import CSV] Error: {e}")
+            preview_rows = []
+        if not preview_rows:
             QMessageBox.warning(self, "Import CSV", "No valid rows found.")
             return
-        preview_rows = all_rows[:10]
         dlg = BulkImportPreviewDialog(preview_rows, self)
         if dlg.exec() == QDialog.Rejected:
             self.statusBar().showMessage("CSV import canceled", 3000)
             return
-        count = 0
-        for row in all_rows:
-            try:
-                wins = int(row.get("wins", 0) or 0)
-                losses = int(row.get("losses", 0) or 0)
-                wr_str = row.get("winrate", "").strip()
-                winrate = (
-                    float(wr_str)
-                    if wr_str
-                    else (wins / (wins + losses) * 100 if (wins + losses) else 0.0)
-                )
-                lvl = int(row.get("level", 0) or 0)
-                acc = Account(
-                    region=row.get("region", ""),
-                    type=row.get("type", ""),
-                    username=row.get("username", ""),
-                    password=row.get("password", ""),
-                    level=lvl,
-                    mail=row.get("mail", ""),
-                    ranked=row.get("ranked", ""),
-                    wins=wins,
-                    losses=losses,
-                    winrate=round(winrate, 1),
-                    riot_id=row.get("riot_id", "")
-                )
-                self.db.add_account(acc)
-                count += 1
-            except Exception:
-                continue
-        self.load_data_async()
-        self.statusBar().showMessage(f"Imported {count} rows", 4000)
+        self.start_import(csv_import_thread(self.db, path, encoding, dlg.conflict_policy()))
+
+    def start_import(self, thread):
+        self.statusBar().showMessage(f"{thread.label}…")
+        self.import_thread = thread
+        thread.progress.connect(
+            lambda count: self.statusBar().showMessage(f"{thread.label}… {count} rows")
+        )
+        thread.failed.connect(lambda msg: QMessageBox.warning(self, thread.label, msg))
+        thread.groups_added.connect(self.on_groups_added)
+        thread.accounts_changed.connect(self.on_accounts_changed)
+        thread.imported.connect(self.on_imported)
+        thread.start()
+
+    def on_groups_added(self, groups):
+        if self.model is not None:
+            self.model.add_groups(groups)
+
+    def on_accounts_changed(self, accounts):
+        if self.model is not None:
+            self.model.merge_accounts(accounts)
+
+    def on_imported(self, inserted, updated, duplicates, invalid):
+        msg = f"Imported {inserted} rows"
+        if updated:
+            msg += f", updated {updated}"
+        if duplicates:
+            msg += f", skipped {duplicates} duplicates"
+        if invalid:
+            msg += f", {invalid} invalid"
+        self.statusBar().showMessage(msg, 4000)
 
     def export_csv(self):
+        from app.exporter import export_csv
+
         path, _ = QFileDialog.getSaveFileName(self, "Export CSV", "", "CSV Files (*.csv)")
         if not path:
             return
         try:
-            accounts = self.db.fetch_accounts()
-            with open(path, "w", newline="", encoding="utf-8-sig") as f:
-                writer = csv.writer(f)
-                writer.writerow([
-                    "Username", "Password", "Level", "Email", "Ranked",
-                    "Wins/Losses", "Winrate", "Riot ID"
-                ])
-                for region, types in accounts.items():
-                    for ttype, accs in types.items():
-                        for acc in accs:
-                            writer.writerow([
-                                acc.username,
-                                acc.password,
-                                acc.level,
-                                acc.mail,
-                                acc.ranked,
-                                f"{acc.wins}/{acc.losses}",
-                                f"{acc.winrate}%",
-                                acc.riot_id
-                            ])
+            self.writer.flush()
+            export_csv(self.db, path)
             self.statusBar().showMessage("Exported CSV", 4000)
         except Exception as e:
             print(f"[Export CSV] Error: {e}")
             self.statusBar().showMessage("Export CSV failed", 4000)
 
     def import_json(self):
+        import json
+        from app.dialogs import BulkImportPreviewDialog
+        from app.importer import json_import_thread
+
         path, _ = QFileDialog.getOpenFileName(self, "Import JSON", "", "JSON Files (*.json)")
         if not path:
             return
         try:
             with open(path, encoding="utf-8") as f:
                 data = json.load(f)
-            count = 0
-            for entry in data:
-                try:
-                    acc = Account(**entry)
-                    self.db.add_account(acc)
-                    count += 1
-                except Exception:
-                    continue
-            self.load_data_async()
-            self.statusBar().showMessage(f"Imported {count} entries", 4000)
+            preview_rows = [
+                {key: "" if val is None else str(val) for key, val in entry.items()}
+                for entry in data[:10]
+            ]
         except Exception as e:
             print(f"[Import JSON] Error: {e}")
             self.statusBar().showMessage("Import JSON failed", 4000)
+            return
+        if not preview_rows:
+            QMessageBox.warning(self, "Import JSON", "No valid entries found.")
+            return
+        dlg = BulkImportPreviewDialog(preview_rows, self, "JSON Preview (first 10 entries)")
+        if dlg.exec() == QDialog.Rejected:
+            self.statusBar().showMessage("JSON import canceled", 3000)
+            return
+        self.start_import(json_import_thread(self.db, path, dlg.conflict_policy()))
 
     def export_json(self):
+        from app.exporter import export_json
+
         path, _ = QFileDialog.getSaveFileName(self, "Export JSON", "", "JSON Files (*.json)")
         if not path:
             return
         try:
-            accounts = self.db.fetch_accounts()
-            flat = []
-            for types in accounts.values():
-                for accs in types.values():
-                    for acc in accs:
-                        flat.append(acc.__dict__)
-            with open(path, "w", encoding="utf-8") as f:
-                json.dump(flat, f, indent=4, ensure_ascii=False)
+            self.writer.flush()
+            export_json(self.db, path)
             self.statusBar().showMessage("Exported JSON", 4000)
         except Exception as e:
             print(f"[Export JSON] Error: {e}")
             self.statusBar().showMessage("Export JSON failed", 4000)
 
-    def sync_riot(self):
-        self.statusBar().showMessage("Syncing with Riot…")
+    def sync_riot(self, force=False, resume_run=None):
+        from app.riot_api import RiotUpdateThread
+
+        self.statusBar().showMessage("Resuming Riot sync…" if resume_run else "Syncing with Riot…")
         self.actions["Sync Riot"].setEnabled(False)
-        self.riot_thread = RiotUpdateThread(DB_PATH, "YOUR-RIOT-API-KEY")
+        self.cancel_sync_action.setVisible(True)
+        # Accounts synced within the last few hours are skipped unless forced
+        self.riot_thread = RiotUpdateThread(
+            self.db, "YOUR-RIOT-API-KEY", force=force, resume_run=resume_run,
+            fetch_levels=self.update_levels_action.isChecked(),
+        )
+        self.riot_thread.account_synced.connect(self.on_account_synced)
+        self.riot_thread.progress.connect(self.on_riot_progress)
         self.riot_thread.finished.connect(self.on_riot_synced)
+        self.log_panel.watch(self.riot_thread.telemetry)
         self.riot_thread.start()
 
+    def cancel_sync(self):
+        riot_thread = getattr(self, "riot_thread", None)
+        if riot_thread is not None and riot_thread.isRunning():
+            self.statusBar().showMessage("Cancelling Riot sync…")
+            riot_thread.cancel()
+
+    def resume_interrupted_sync(self):
+        run = self.db.resumable_sync_run()
+        if run is not None:
+            self.sync_riot(resume_run=run)
+
+    def on_riot_progress(self, done, total):
+        self.statusBar().showMessage(f"Syncing with Riot… {done}/{total}")
+
+    def on_account_synced(self, update):
+        from app.riot_api import sync_fields
+
+        # The sync thread saves its results in batches; only the view needs updating here
+        if self.model is None:
+            return
+        fields = sync_fields(update)
+        if not self.model.update_account(update[0], fields):
+            # Not paged in yet, but the new values may move it into the loaded rows
+            self._unloaded_synced[update[0]] = fields
+            if not self.sync_merge_timer.isActive():
+                self.sync_merge_timer.start()
+
+    def merge_unloaded_synced(self):
+        pending, self._unloaded_synced = self._unloaded_synced, {}
+        if self.model is None or not pending:
+            return
+        accounts = self.db.fetch_accounts_by_ids(pending, self.search_box.text().strip() or None)
+        for acc in accounts:
+            for name, value in pending[acc.id].items():
+                setattr(acc, name, value)
+        self.model.merge_accounts(accounts)
+
     def on_riot_synced(self, updates):
-        self.ranked_info = {}
-        for acc_id, lvl, wins, losses, ranked in updates:
-            self.db.update_field(acc_id, "level", lvl)
-            self.db.update_field(acc_id, "wins", wins)
-            self.db.update_field(acc_id, "losses", losses)
-            self.db.update_field(acc_id, "ranked", ranked)
-            wr = round(wins / (wins + losses) * 100, 1) if (wins + losses) else 0.0
-            self.db.update_field(acc_id, "winrate", wr)
-            self.ranked_info[acc_id] = ranked
-        self.load_data_async()
-        self.statusBar().showMessage("Riot sync complete", 3000)
+        if self.riot_thread.status == "cancelled":
+            msg = f"Riot sync cancelled ({len(updates)} updated"
+        elif self.riot_thread.status == "failed":
+            msg = f"Riot sync stopped by a database error, see Logs ({len(updates)} updated"
+        else:
+            msg = f"Riot sync complete ({len(updates)} updated"
+        if self.riot_thread.skipped_fresh:
+            msg += f", {self.riot_thread.skipped_fresh} synced recently and skipped"
+        failed = len(self.riot_thread.telemetry.skipped)
+        if failed:
+            msg += f", {failed} failed, see Logs"
+        self.statusBar().showMessage(msg + ")", 5000 if failed else 3000)
         self.actions["Sync Riot"].setEnabled(True)
+        self.cancel_sync_action.setVisible(False)
+        self.log_panel.stop_watching()
 
     def load_data_async(self):
-        self.loader = LoadThread(DB_PATH)
-        self.loader.accounts_loaded.connect(self.on_accounts_loaded)
-        self.loader.start()
-
-    def on_accounts_loaded(self, accounts):
-        from PySide6.QtWidgets import QHeaderView
-        model = QStandardItemModel()
-        model.setHorizontalHeaderLabels([
-            "Username", "Password", "Level", "Email", "", "Rank",
-            "Wins/Losses", "Winrate", "Riot ID"
-        ])
-        model.itemChanged.connect(self.on_item_changed)
-    
-        for region, types in accounts.items():
-            # Region row: non-editable, all columns
-            region_items = [QStandardItem("") for _ in range(9)]
-            region_item = QStandardItem(region)
-            region_item.setEditable(False)
-            region_items[0] = region_item
-            for col in range(1, 9):
-                region_items[col].setEditable(False)
-            model.appendRow(region_items)
-    
-            for ttype, accs in types.items():
-                # Type row: non-editable, all columns
-                type_items = [QStandardItem("") for _ in range(9)]
-                type_item = QStandardItem(ttype)
-                type_item.setEditable(False)
-                type_items[0] = type_item
-                for col in range(1, 9):
-                    type_items[col].setEditable(False)
-                region_item.appendRow(type_items)
-    
-                accs = sorted(accs, key=lambda a: a.level, reverse=True)
-                for acc in accs:
-                    acc_items = [QStandardItem("") for _ in range(9)]
-    
-                    username_item = QStandardItem(acc.username)
-                    username_item.setTextAlignment(Qt.AlignCenter)
-                    username_item.setFlags(Qt.ItemIsSelectable | Qt.ItemIsEnabled | Qt.ItemIsEditable)
-                    username_item.setData(acc.username, Qt.UserRole + 1)
-                    username_item.setData(acc.id, Qt.UserRole)
-                    acc_items[0] = username_item
-    
-                    pwd_item = QStandardItem("***")
-                    pwd_item.setData(acc.password, Qt.UserRole + 1)
-                    pwd_item.setData(acc.id, Qt.UserRole)
-                    pwd_item.setFlags(Qt.ItemIsSelectable | Qt.ItemIsEnabled | Qt.ItemIsEditable)
-                    pwd_item.setTextAlignment(Qt.AlignCenter)
-                    acc_items[1] = pwd_item
-    
-                    level_item = QStandardItem(str(acc.level))
-                    level_item.setTextAlignment(Qt.AlignCenter)
-                    level_item.setFlags(Qt.ItemIsSelectable | Qt.ItemIsEnabled | Qt.ItemIsEditable)
-                    level_item.setData(acc.id, Qt.UserRole)
-                    acc_items[2] = level_item
-    
-                    email_item = QStandardItem(acc.mail)
-                    email_item.setTextAlignment(Qt.AlignCenter)
-                    email_item.setFlags(Qt.ItemIsSelectable | Qt.ItemIsEnabled | Qt.ItemIsEditable)
-                    email_item.setData(acc.id, Qt.UserRole)
-                    acc_items[3] = email_item
-    
-                    rank_icon_item = QStandardItem("")
-                    rank_icon_item.setEditable(False)
-                    acc_items[4] = rank_icon_item
-    
-                    ranked_str = acc.ranked or self.ranked_info.get(acc.id, "")
-                    rank_text_item = QStandardItem(ranked_str)
-                    rank_text_item.setTextAlignment(Qt.AlignCenter)
-                    # Editable only if level >= 30
-                    flags = Qt.ItemIsSelectable | Qt.ItemIsEnabled
-                    if acc.level >= 30:
-                        flags |= Qt.ItemIsEditable
-                    rank_text_item.setFlags(flags)
-                    rank_text_item.setData(acc.id, Qt.UserRole)
-                    acc_items[5] = rank_text_item
-    
-                    if acc.level < 30:
-                        wl_text = ""
-                        wr_text = ""
-                    else:
-                        wl_text = f"{acc.wins}/{acc.losses}"
-                        wr_text = f"{acc.winrate}%"
-    
-                    wl_item = QStandardItem(wl_text)
-                    wl_item.setTextAlignment(Qt.AlignCenter)
-                    flags = Qt.ItemIsSelectable | Qt.ItemIsEnabled
-                    if acc.level >= 30:
-                        flags |= Qt.ItemIsEditable
-                    wl_item.setFlags(flags)
-                    wl_item.setData(acc.id, Qt.UserRole)
-                    acc_items[6] = wl_item
-    
-                    wr_item = QStandardItem(wr_text)
-                    wr_item.setTextAlignment(Qt.AlignCenter)
-                    wr_item.setFlags(Qt.ItemIsSelectable | Qt.ItemIsEnabled)
-                    wr_item.setData(acc.id, Qt.UserRole)
-                    acc_items[7] = wr_item
-    
-                    riot_item = QStandardItem(acc.riot_id)
-                    riot_item.setTextAlignment(Qt.AlignCenter)
-                    riot_item.setFlags(Qt.ItemIsSelectable | Qt.ItemIsEnabled | Qt.ItemIsEditable)
-                    riot_item.setData(acc.id, Qt.UserRole)
-                    acc_items[8] = riot_item
-    
-                    type_item.appendRow(acc_items)
-    
-        self.tree.setModel(model)
-        self.tree.expandAll()
-        self.tree.setStyleSheet("QTreeView::item { height: 18px; }")
-    
-        self.tree.setItemDelegateForColumn(1, PasswordDelegate(self))
-        ranked_icon_path = os.path.abspath("assets/ranks")
-        self.tree.setItemDelegateForColumn(4, RankOnlyIconDelegate(ranked_icon_path, self.tree))
-    
-        header = self.tree.header()
-        header.setDefaultAlignment(Qt.AlignCenter)
-        for col in range(model.columnCount()):
-            header.setSectionResizeMode(col, QHeaderView.ResizeToContents)
-        header.setSectionResizeMode(4, QHeaderView.Fixed)
-        header.resizeSection(4, 24)
-    
-        self.statusBar().showMessage("Data loaded", 2000)
-
-    def on_item_changed(self, item):
-        acc_id = item.data(Qt.UserRole)
-        col = item.column()
-        text = item.text()
-
-        if col == 0:  # Username
-            if text != "***":
-                self.db.update_field(acc_id, "username", text)
-        elif col == 1:  # Password (stored via UserRole+1)
-            new_pwd = item.data(Qt.UserRole + 1)
-            self.db.update_field(acc_id, "password", new_pwd)
-        elif col == 2:  # Level
-            try:
-                lvl = int(text)
-                self.db.update_field(acc_id, "level", lvl)
-                # Update editability of rank and wins/losses columns
-                parent_item = item.parent()
-                row = item.row()
-                # Rank text (col 5)
-                rank_item = parent_item.child(row, 5) if parent_item else None
-                if rank_item:
-                    flags = Qt.ItemIsSelectable | Qt.ItemIsEnabled
-                    if lvl >= 30:
-                        flags |= Qt.ItemIsEditable
-                    rank_item.setFlags(flags)
-                # Wins/Losses (col 6)
-                wl_item = parent_item.child(row, 6) if parent_item else None
-                if wl_item:
-                    flags = Qt.ItemIsSelectable | Qt.ItemIsEnabled
-                    if lvl >= 30:
-                        flags |= Qt.ItemIsEditable
-                    wl_item.setFlags(flags)
-            except ValueError:
-                pass
-        elif col == 3:  # Email
-            self.db.update_field(acc_id, "mail", text)
-        elif col == 4:  # Ranked icon (do nothing)
-            pass
-        elif col == 5:  # Rank text
-            self.db.update_field(acc_id, "ranked", text)
-            self.ranked_info[acc_id] = text
-        elif col == 6:  # Wins/Losses
-            try:
-                wins_str, losses_str = text.split("/")
-                wins = int(wins_str)
-                losses = int(losses_str)
-                self.db.update_field(acc_id, "wins", wins)
-                self.db.update_field(acc_id, "losses", losses)
-                wr = round(wins / (wins + losses) * 100, 1) if (wins + losses) else 0.0
-                self.db.update_field(acc_id, "winrate", wr)
-                parent_item = item.parent()
-                if parent_item:
-                    wr_item = parent_item.child(item.row(), 7)
-                    if wr_item:
-                        wr_item.setText(f"{wr}%")
-            except Exception:
-                pass
-        elif col == 8:  # Riot ID
-            self.db.update_field(acc_id, "riot_id", text)
+        if self.db is None:
+            return
+        # The reload must see edits still waiting in the write-behind queue
+        self.writer.flush()
+        self.statusBar().showMessage("Loading accounts…")
+        previous = getattr(self, "loader", None)
+        if previous is not None:
+            # Typing in the search box can start loads back to back; only the last one counts
+            previous.wait()
+        loader = self.loader = LoadThread(self.db, self.search_box.text().strip() or None)
+        loader.groups_loaded.connect(lambda groups: self.on_groups_loaded(loader, groups))
+        loader.start()
+
+    def on_groups_loaded(self, loader, groups):
+        if loader is not self.loader:
+            return
+        # Only the groups are known here; expanding them pages their accounts in
+        self.model.set_groups([(region, ttype) for region, ttype, _ in groups], loader.search)
+        self.fit_columns()
+        total = sum(count for _, _, count in groups)
+        if loader.search:
+            self.statusBar().showMessage(f"{total} matching accounts", 2000)
+        else:
+            self.statusBar().showMessage(f"Data loaded ({total} accounts)", 2000)
+        startup_timer.mark("data loaded")
+        if self._initial_load:
+            self._initial_load = False
+            # Daily backup runs in the background once the accounts are in
+            self.start_backup()
+            # A sync cut short by closing the app (or a crash) picks up where it stopped
+            self.resume_interrupted_sync()
+
+    def apply_search(self):
+        # Matching happens in SQL, so a search is a reload of the group list with a filter
+        self.load_data_async()
+
+    def on_account_edited(self, acc_id, fields, previous):
+        self.writer.enqueue(acc_id, fields, previous)
+
+    def on_write_failed(self, acc_id, previous, message):
+        if "UNIQUE" in message:
+            message = "Username already exists in this region"
+        self.statusBar().showMessage(f"Could not save change: {message}", 5000)
+        if previous and self.model is not None:
+            self.model.update_account(acc_id, previous)
+
+    def closeEvent(self, event):
+        riot_thread = getattr(self, "riot_thread", None)
+        if riot_thread is not None and riot_thread.isRunning():
+            riot_thread.cancel(resume_later=True)
+            riot_thread.wait()
+        if self.writer is not None:
+            self.writer.stop()
+        super().closeEvent(event)
+
+    def start_backup(self):
+        from app.backup import BackupThread
+
+        self.backup_thread = BackupThread(self.db)
+        self.backup_thread.backup_done.connect(self.on_backup_done)
+        self.backup_thread.verification_failed.connect(self.on_backup_verification_failed)
+        self.backup_thread.start()
+
+    def on_backup_done(self, written):
+        if written:
+            self.statusBar().showMessage("Daily backup saved", 3000)
+
+    def on_backup_verification_failed(self, names):
+        QMessageBox.warning(
+            self, "Backup Integrity",
+            "These backups failed CRC validation and may be corrupt:\n" + "\n".join(names)
+        )
+
+    def stop_on_exit(self):
+        """Flush pending edits before quitting. Nothing is exported here: the startup backup
+        covers the day, and edits made since are picked up by the next launch's backup."""
+        if self.db is None:
+            return
+        backup_thread = getattr(self, "backup_thread", None)
+        if backup_thread is not None and backup_thread.isRunning():
+            backup_thread.cancel()
+            backup_thread.wait()
+        self.writer.stop()
 
     def show_account_context_menu(self, index, global_pos):
         from PySide6.QtWidgets import QMenu, QApplication
         from PySide6.QtGui import QAction
 
-        model = self.tree.model()
-        item = model.itemFromIndex(index)
-        acc_id = item.data(Qt.UserRole)
-        parent = item.parent()
-        row = item.row()
+        acc = self.model.account_at(index)
+        if acc is None:
+            return
+        acc_id = acc.id
 
         menu = QMenu()
 
@@ -476,45 +555,16 @@ class MainWindow(QMainWindow):
         menu.addSeparator()
         menu.addAction(act_delete)
 
-        def get_sibling(col):
-            return parent.child(row, col) if parent else None
-
         def copy_username():
-            user_item = get_sibling(0)
-            if user_item:
-                QApplication.clipboard().setText(user_item.text())
+            QApplication.clipboard().setText(acc.username)
 
         def copy_password():
-            pwd_item = get_sibling(1)
-            if pwd_item:
-                pwd = pwd_item.data(Qt.UserRole + 1)
-                QApplication.clipboard().setText(pwd)
-
-        def toggle_username():
-            user_item = get_sibling(0)
-            if not user_item:
-                return
-            if user_item.text().startswith("***"):
-                real_username = user_item.data(Qt.UserRole + 1)
-                user_item.setText(real_username)
-            else:
-                user_item.setText("***")
-
-        def toggle_password():
-            pwd_item = get_sibling(1)
-            if not pwd_item:
-                return
-            if pwd_item.text().startswith("***"):
-                pwd = pwd_item.data(Qt.UserRole + 1)
-                pwd_item.setText(pwd)
-            else:
-                pwd_item.setText("***")
+            QApplication.clipboard().setText(acc.password)
 
         def delete_account():
             if self.confirm_delete_account(acc_id):
-                self.db.cursor.execute("DELETE FROM accounts WHERE id = ?", (acc_id,))
-                self.db.conn.commit()
-                self.load_data_async()
+                self.db.delete_account(acc_id)
+                self.model.remove_account(acc_id)
 
         act_copy_user.triggered.connect(copy_username)
         act_copy_pass.triggered.connect(copy_password)
@@ -539,31 +589,17 @@ class MainWindow(QMainWindow):
     def toggle_show_usernames(self):
         self.show_usernames = not self.show_usernames
         self.toggle_user_btn.setText("Show Usernames" if not self.show_usernames else "Hide Usernames")
-        model = self.tree.model()
-        for region in range(model.rowCount()):
-            region_item = model.item(region, 0)
-            for t in range(region_item.rowCount()):
-                type_item = region_item.child(t, 0)
-                for row in range(type_item.rowCount()):
-                    user_item = type_item.child(row, 0)
-                    real_username = user_item.data(Qt.UserRole + 1)
-                    if self.show_usernames:
-                        user_item.setText(real_username)
-                    else:
-                        user_item.setText("***")
+        self.username_delegate.masked = not self.show_usernames
+        self._refresh_masked_column(0)
 
     def toggle_show_passwords(self):
         self.show_passwords = not self.show_passwords
         self.toggle_pass_btn.setText("Hide Passwords" if self.show_passwords else "Show Passwords")
-        model = self.tree.model()
-        for region in range(model.rowCount()):
-            region_item = model.item(region, 0)
-            for t in range(region_item.rowCount()):
-                type_item = region_item.child(t, 0)
-                for row in range(type_item.rowCount()):
-                    pwd_item = type_item.child(row, 1)
-                    real_pwd = pwd_item.data(Qt.UserRole + 1)
-                    if self.show_passwords:
-                        pwd_item.setText(real_pwd)
-                    else:
-                        pwd_item.setText("***")
+        self.password_delegate.masked = not self.show_passwords
+        self._refresh_masked_column(1)
+
+    def _refresh_masked_column(self, col):
+        # Only the visible rows repaint; the model and database are untouched
+        self.tree.viewport().update()
+        if self.model is not None:
+            self.tree.resizeColumnToContents(col)
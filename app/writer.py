@@ -0,0 +1,93 @@
+# app/writer.py
+import sqlite3
+import threading
+
+from PySide6.QtCore import QThread, Signal
+
+# How long the writer keeps collecting edits before committing them together
+FLUSH_DELAY = 0.2
+
+
+class WriteBehindQueue(QThread):
+    """Writes queued account edits on a background thread in grouped transactions.
+
+    Repeated edits to the same (account, field) before a flush collapse into one write.
+    """
+
+    # account id, previous values of the fields that could not be written, error message
+    write_failed = Signal(int, dict, str)
+
+    def __init__(self, db):
+        super().__init__()
+        self.db = db
+        self._cond = threading.Condition()
+        # (account id, field) -> [value, previous value]
+        self._pending = {}
+        self._queued = 0
+        self._written = 0
+        self._stopping = False
+
+    def enqueue(self, acc_id, fields, previous=None):
+        previous = previous or {}
+        with self._cond:
+            for name, value in fields.items():
+                entry = self._pending.get((acc_id, name))
+                if entry is None:
+                    self._pending[(acc_id, name)] = [value, previous.get(name)]
+                else:
+                    entry[0] = value
+            self._queued += 1
+            self._cond.notify_all()
+
+    def flush(self):
+        """Block until everything queued so far has been written."""
+        with self._cond:
+            target = self._queued
+            self._cond.notify_all()
+            while self._written < target and self.isRunning():
+                self._cond.wait(FLUSH_DELAY)
+
+    def stop(self):
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+        self.wait()
+
+    def run(self):
+        while True:
+            with self._cond:
+                while not self._pending and not self._stopping:
+                    self._cond.wait()
+                if not self._stopping:
+                    self._cond.wait(FLUSH_DELAY)
+                batch, self._pending = self._pending, {}
+                target = self._queued
+                stopping = self._stopping
+            if batch:
+                self._write(batch)
+            with self._cond:
+                self._written = target
+                self._cond.notify_all()
+                if stopping and not self._pending:
+                    break
+        self.db.close_thread_connection()
+
+    def _write(self, batch):
+        changes = {}
+        previous = {}
+        for (acc_id, name), (value, old) in batch.items():
+            changes.setdefault(acc_id, {})[name] = value
+            if old is not None:
+                previous.setdefault(acc_id, {})[name] = old
+        try:
+            self.db.update_fields(list(changes.items()))
+            return
+        except sqlite3.Error:
+            pass
+        # Something in the group was rejected; retry per account to find the culprit
+        for acc_id, fields in changes.items():
+            try:
+                self.db.update_fields([(acc_id, fields)])
+            except sqlite3.Error as e:
+                print(f"[Write] Error: {e}")
+                self.write_failed.emit(acc_id, previous.get(acc_id, {}), str(e))
@@ -0,0 +1,32 @@
+# benchmarks/compare.py
+"""Compare two benchmark result files.
+
+    python -m benchmarks.compare before.json after.json
+"""
+import argparse
+import json
+import sys
+
+
+def load_results(path):
+    with open(path, encoding="utf-8") as f:
+        report = json.load(f)
+    return {(r["size"], r["name"]): r for r in report["results"]}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare two benchmark runs.")
+    parser.add_argument("before")
+    parser.add_argument("after")
+    args = parser.parse_args(argv)
+
+    before, after = load_results(args.before), load_results(args.after)
+    print(f"{'size':>9} {'benchmark':<18} {'before':>10} {'after':>10} {'change':>8}")
+    for key in sorted(before.keys() & after.keys()):
+        old, new = before[key]["seconds"], after[key]["seconds"]
+        change = f"{(new - old) / old * 100:+7.1f}%" if old else ""
+        print(f"{key[0]:>9} {key[1]:<18} {old * 1000:8.1f}ms {new * 1000:8.1f}ms {change:>8}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
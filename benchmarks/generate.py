@@ -0,0 +1,94 @@
+# benchmarks/generate.py
+"""Deterministic synthetic account databases for the benchmark suite.
+
+    python -m benchmarks.generate 100000 bench.db
+"""
+import argparse
+import csv
+import os
+import random
+import sys
+
+from app.database import ACCOUNT_FIELDS, Account, DatabaseManager
+
+# Same choices as AccountDialog
+REGIONS = ("EUNE", "EUW", "TR", "PBE")
+TYPES = ("Mine", "Others")
+TIERS = ("I", "B", "S", "G", "P", "E", "D")
+APEX = ("M", "GM", "C")
+DIVISIONS = ("IV", "III", "II", "I")
+CHUNK_SIZE = 50000
+
+
+def synthetic_account(rng, index):
+    region = REGIONS[index % len(REGIONS)]
+    level = rng.randint(1, 500)
+    ranked, wins, losses = "", 0, 0
+    if level >= 30 and rng.random() < 0.7:
+        if rng.random() < 0.03:
+            ranked = f"{rng.choice(APEX)} {rng.randint(0, 1500)}LP"
+        else:
+            ranked = f"{rng.choice(TIERS)}{rng.choice(DIVISIONS)}/{rng.randint(0, 99)}LP"
+        wins, losses = rng.randint(0, 400), rng.randint(0, 400)
+    return Account(
+        region=region,
+        type=TYPES[rng.random() < 0.3],
+        username=f"acc{index:07d}",
+        password=f"pw{rng.getrandbits(40):010x}",
+        level=level,
+        mail=f"acc{index:07d}@example.com",
+        ranked=ranked,
+        wins=wins,
+        losses=losses,
+        winrate=round(wins / (wins + losses) * 100, 1) if (wins + losses) else 0.0,
+        riot_id=f"Player{index}#{region}",
+    )
+
+
+def iter_accounts(rows, seed=0):
+    rng = random.Random(seed)
+    for index in range(rows):
+        yield synthetic_account(rng, index)
+
+
+def generate_database(path, rows, seed=0):
+    """Create `path` holding `rows` synthetic accounts; an existing file is replaced."""
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+    db = DatabaseManager(path)
+    chunk = []
+    for acc in iter_accounts(rows, seed):
+        chunk.append(acc)
+        if len(chunk) == CHUNK_SIZE:
+            db.add_accounts(chunk)
+            chunk = []
+    if chunk:
+        db.add_accounts(chunk)
+    db.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    db.close_thread_connection()
+    return path
+
+
+def write_import_csv(path, rows, seed=0):
+    """Write `rows` synthetic accounts in the column layout ImportThread reads."""
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(ACCOUNT_FIELDS)
+        for acc in iter_accounts(rows, seed):
+            writer.writerow([getattr(acc, name) for name in ACCOUNT_FIELDS])
+    return path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate a synthetic accounts database.")
+    parser.add_argument("rows", type=int)
+    parser.add_argument("path")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    generate_database(args.path, args.rows, args.seed)
+    print(f"Wrote {args.rows} accounts to {args.path}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,248 @@
+# benchmarks/run.py
+"""Headless benchmark suite: times the load, model, import/export, password toggle and
+Riot sync paths over synthetic databases and writes the results as JSON.
+
+    python -m benchmarks.run --sizes 1000 10000 --output results.json
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import PySide6
+from PySide6.QtWidgets import QApplication
+
+from app.account_model import AccountTreeModel
+from app.database import DatabaseManager
+from app.exporter import export_csv, export_json
+from app.importer import csv_import_thread, json_import_thread
+from app.load import LoadThread
+from app.riot_api import RiotUpdateThread
+from app.riot_mock import MockConfig, RiotMock
+from app.ui_main import MainWindow
+from benchmarks.generate import generate_database, write_import_csv
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_SIZES = (1000, 10000, 100000, 1000000)
+# Sync makes one request per cached account and two per uncached one (plus summoner-v4
+# when levels are fetched), so it only runs on a slice of each database
+DEFAULT_SYNC_ROWS = 1000
+
+
+class Benchmark:
+    """One timed step. `setup` runs untimed before every measurement and its result
+    is passed to `fn`; `teardown` gets the same value afterwards."""
+
+    def __init__(self, name, fn, setup=None, teardown=None):
+        self.name = name
+        self.fn = fn
+        self.setup = setup or (lambda: None)
+        self.teardown = teardown or (lambda state: None)
+
+    def measure(self, memory=True):
+        state = self.setup()
+        gc.collect()
+        start = time.perf_counter()
+        self.fn(state)
+        seconds = time.perf_counter() - start
+        self.teardown(state)
+
+        peak = None
+        if memory:
+            # tracemalloc slows Python code down, so memory gets its own run
+            state = self.setup()
+            gc.collect()
+            tracemalloc.start()
+            self.fn(state)
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            self.teardown(state)
+        return seconds, peak
+
+
+def fresh_copy(src, workdir, name):
+    path = os.path.join(workdir, name)
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+    shutil.copyfile(src, path)
+    return path
+
+
+def suite(app, db_path, workdir, rows, sync_rows, mock_config):
+    """The benchmarks for one database size, in the order they run."""
+    db = DatabaseManager(db_path)
+    csv_input = write_import_csv(os.path.join(workdir, "import.csv"), rows)
+    json_input = os.path.join(workdir, "import.json")
+    export_json(db, json_input)
+
+    def open_window():
+        window = MainWindow(db_path)
+        window._initial_load = False  # no daily backup during benchmarks
+        window.show()
+        app.processEvents()
+        return window
+
+    def load_window(window):
+        window.start()
+        window.loader.wait()
+        # Delivers groups_loaded; the tree pages in the first rows while laying out
+        app.processEvents()
+        app.processEvents()
+
+    def close_window(window):
+        window.writer.stop()
+        window.close()
+        window.db.close_thread_connection()
+        window.deleteLater()
+        app.processEvents()
+
+    def loaded_window():
+        window = open_window()
+        load_window(window)
+        return window
+
+    def toggle_passwords(window):
+        for _ in range(2):
+            window.toggle_show_passwords()
+            window.tree.viewport().repaint()
+
+    def empty_db(name):
+        def setup():
+            return DatabaseManager(fresh_copy(db_path, workdir, name)), name
+        return setup
+
+    def cleared(setup):
+        def wrapped():
+            target, name = setup()
+            target.delete_all()
+            return target
+        return wrapped
+
+    def close_db(target):
+        target.close_thread_connection()
+
+    def sync_setup():
+        target = DatabaseManager(fresh_copy(db_path, workdir, "sync.db"))
+        # Only the first `sync_rows` accounts keep a Riot ID to sync
+        target.conn.execute("UPDATE accounts SET riot_id = '' WHERE id > ?", (sync_rows,))
+        target.conn.commit()
+        return target
+
+    def sync(target, fetch_levels=False):
+        with RiotMock(mock_config) as mock:
+            RiotUpdateThread(target, "benchmark", mock.base_url, fetch_levels=fetch_levels).run()
+
+    benchmarks = [
+        Benchmark("fetch_accounts", lambda _: db.fetch_accounts()),
+        Benchmark("load_thread", lambda _: LoadThread(db).run()),
+        Benchmark("model_build", lambda grouped: AccountTreeModel(grouped), setup=db.fetch_accounts),
+        Benchmark("window_load", load_window, setup=open_window, teardown=close_window),
+        Benchmark("toggle_passwords", toggle_passwords, setup=loaded_window, teardown=close_window),
+        Benchmark("export_csv", lambda _: export_csv(db, os.path.join(workdir, "export.csv"))),
+        Benchmark("export_json", lambda _: export_json(db, os.path.join(workdir, "export.json"))),
+        Benchmark(
+            "import_csv",
+            lambda target: csv_import_thread(target, csv_input, "utf-8").run(),
+            setup=cleared(empty_db("import.db")), teardown=close_db,
+        ),
+        Benchmark(
+            "import_json",
+            lambda target: json_import_thread(target, json_input).run(),
+            setup=cleared(empty_db("import.db")), teardown=close_db,
+        ),
+    ]
+    if sync_rows:
+        benchmarks.append(Benchmark("riot_sync", sync, setup=sync_setup, teardown=close_db))
+        benchmarks.append(Benchmark(
+            "riot_sync_levels", lambda target: sync(target, fetch_levels=True), setup=sync_setup, teardown=close_db
+        ))
+    return db, benchmarks
+
+
+def database_for(rows, data_dir, seed):
+    """Generate the database for `rows`, or reuse one cached in `data_dir`."""
+    path = os.path.join(data_dir, f"accounts-{rows}-{seed}.db")
+    if not os.path.exists(path):
+        print(f"Generating {rows} accounts…", file=sys.stderr)
+        generate_database(path, rows, seed)
+    return path
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the LoLAccountsManager benchmarks headless.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--output", help="write the JSON results here instead of stdout")
+    parser.add_argument("--only", nargs="+", help="run only these benchmarks")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--data-dir", help="keep generated databases here between runs")
+    parser.add_argument("--sync-rows", type=int, default=DEFAULT_SYNC_ROWS,
+                        help="accounts synced against the local Riot stub (0 skips sync)")
+    parser.add_argument("--sync-latency", type=float, default=0.0, help="mock Riot API latency in seconds")
+    parser.add_argument("--sync-app-limit", default=MockConfig().app_limit, help='mock rate limit, e.g. "20:1,100:120"')
+    parser.add_argument("--sync-error-rate", type=float, default=0.0, help="share of mock responses that are 503s")
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc runs")
+    args = parser.parse_args(argv)
+
+    mock_config = MockConfig(
+        latency=args.sync_latency, app_limit=args.sync_app_limit, error_rate=args.sync_error_rate, seed=args.seed
+    )
+    app = QApplication.instance() or QApplication(sys.argv[:1])
+    results = []
+    with tempfile.TemporaryDirectory(prefix="lolam-bench-") as workdir:
+        data_dir = args.data_dir or workdir
+        os.makedirs(data_dir, exist_ok=True)
+        for rows in args.sizes:
+            db_path = database_for(rows, data_dir, args.seed)
+            db, benchmarks = suite(
+                app, db_path, workdir, rows, min(rows, args.sync_rows), mock_config
+            )
+            for bench in benchmarks:
+                if args.only and bench.name not in args.only:
+                    continue
+                seconds, peak = bench.measure(memory=not args.no_memory)
+                results.append({"size": rows, "name": bench.name, "seconds": round(seconds, 4), "peak_bytes": peak})
+                peak_text = f"{peak / 1e6:9.1f} MB" if peak is not None else ""
+                print(f"{rows:>9} {bench.name:<18} {seconds * 1000:10.1f} ms {peak_text}", file=sys.stderr)
+            db.close_thread_connection()
+
+    report = {
+        "meta": {
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "pyside": PySide6.__version__,
+            "platform": platform.platform(),
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "seed": args.seed,
+        },
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=4)
+    else:
+        json.dump(report, sys.stdout, indent=4)
+        print()
+
+
+if __name__ == "__main__":
+    sys.exit(main())